@@ -1,15 +1,30 @@
-from app.routes import audit, auth, claims,payments, reviews,users,policy,employer,provider,policyholder
-from fastapi import FastAPI, APIRouter
+from app.routes import audit, auth, batch, claims,payments, reviews,users,policy,employer,provider,policyholder
+import os
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, APIRouter
+from fastapi.responses import ORJSONResponse
 
-from app.routes import users
 from app.core.config import settings
+from app.db.session import async_engine
 from app.middleware import register_middleware 
 
 
 version = "v1"
 version_prefix =f"/{version}"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the OpenAPI schema up front instead of on the first /docs hit.
+    app.openapi()
+    # Uploads write straight into this directory; create it once per process.
+    os.makedirs(settings.UPLOAD_DIRECTORY, exist_ok=True)
+    yield
+    # Close the shared pool's connections cleanly on shutdown.
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="MedicalClaims API",
     description="API for MedicalClaims system",
@@ -22,7 +37,9 @@ app = FastAPI(
     terms_of_service="https://example.com/tos",
     openapi_url=f"{version_prefix}/openapi.json",
     docs_url=f"{version_prefix}/docs",
-    redoc_url=f"{version_prefix}/redoc"
+    redoc_url=f"{version_prefix}/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 ) 
 
 register_middleware(app)
@@ -39,6 +56,7 @@ api_router.include_router(policy.router, prefix=f"{version_prefix}/policy", tags
 api_router.include_router(employer.router, prefix=f"{version_prefix}/employer", tags=["Employer"]) 
 api_router.include_router(policyholder.router, prefix=f"{version_prefix}/policyholders", tags=["Policyholders"])
 api_router.include_router(provider.router, prefix=f"{version_prefix}/providers", tags=["Providers"])
+api_router.include_router(batch.router, prefix=f"{version_prefix}/batch", tags=["Batch"])
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 
 from pydantic import AnyHttpUrl, EmailStr, field_validator
@@ -23,10 +24,23 @@ class Settings(BaseSettings):
     ENABLE_EMAIL_NOTIFICATIONS: bool = True
     ENABLE_SMS_NOTIFICATIONS: bool = True
     ENABLE_IN_APP_NOTIFICATIONS: bool = True
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_QUERY_CACHE_SIZE: int = 1200
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode.
+    DB_PGBOUNCER: bool = False
     
     class Config: 
         env_file = ".env"
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
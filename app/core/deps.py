@@ -47,11 +47,22 @@ class RefreshTokenBearer(TokenBearer):
 
 
 async def get_current_user(
+    request: Request,
     db: AsyncSession = Depends(get_db), token: dict = Depends(AccessTokenBearer())
 ) :
+          # Resolve the user once per request; request.state also keeps a
+          # strong reference so the instance stays in the session's identity map.
+          user = getattr(request.state, "user", None)
+          if user is not None:
+                return user
+
           email = token["user"]["email"]
+          raw_token = request.headers.get("authorization", "")
           
-          user = await user_crud.get_by_email(db,email)
+          user = await user_crud.get_current_by_token(
+                db, token=raw_token, email=email, expires_at=token.get("exp")
+          )
+          request.state.user = user
           return user
 
 async def get_current_active_user(
@@ -1,14 +1,33 @@
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Union 
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 
+import bcrypt
 import jwt
-from passlib.context import CryptContext
+import orjson
 
 from app.core.config import settings 
+from app.utils.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = 12
+
+# bcrypt releases the GIL, so a thread per core hashes in parallel. Keeping
+# it separate stops login bursts from starving the default executor.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+)
+
+# Verified token payloads keyed by the raw token, each kept until its exp claim.
+_token_cache = TTLCache(maxsize=10000)
+
+# HMAC key and default lifetime are fixed for the process, so derive them once.
+_SIGNING_KEY = settings.SECRET_KEY.encode()
+ACCESS_TOKEN_EXPIRES = timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS)
 
 # JWT Token Generation
 def create_access_token(
@@ -21,11 +40,11 @@ def create_access_token(
     """
     payload = {
         "user": user_data,
-        "exp": datetime.utcnow() + (expiry or timedelta(second=settings.ACCESS_TOKEN_EXPIRE_SECONDS)),
+        "exp": datetime.utcnow() + (expiry or ACCESS_TOKEN_EXPIRES),
         "refresh": refresh
     }
 
-    token = jwt.encode(payload, key=settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    token = jwt.encode(payload, key=_SIGNING_KEY, algorithm=settings.ALGORITHM)
     return token
 
 
@@ -33,31 +52,57 @@ def create_access_token(
 def decode_token(token: str) -> dict | None:
     """
     Decode a JWT token and return payload if valid, else None.
+    Verified payloads are cached until the token expires.
     """
+    token_data = _token_cache.get(token)
+    if token_data is not None:
+        return token_data
     try:
-        token_data = jwt.decode(token, key=settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_data = jwt.decode(token, key=_SIGNING_KEY, algorithms=[settings.ALGORITHM])
+        if "exp" in token_data:
+            _token_cache.set(token, token_data, ttl=token_data["exp"] - time.time())
         return token_data
     except jwt.PyJWTError as e:
         logging.exception("Failed to decode JWT token.")
         return None
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Check a password against a bcrypt hash on the hashing pool so the
+    key schedule does not block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, bcrypt.checkpw, plain_password.encode(), hashed_password.encode()
+    )
+
+def hash_password_sync(password: str) -> str:
+    """
+    Hash a password with bcrypt on the calling thread. For seeding and test
+    fixtures outside the event loop; request handlers use get_password_hash.
+    """
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """
+    Hash a password with bcrypt on the hashing pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password_sync, password)
 
-# URL-safe token serializer (for emails, etc.)
+# URL-safe token serializer (for emails, etc.). orjson emits the same compact
+# JSON as itsdangerous' default serializer, so existing links stay valid.
 serializer = URLSafeTimedSerializer(
     secret_key=settings.SECRET_KEY,
-    salt="email-configuration"
+    salt="email-configuration",
+    serializer=orjson,
 )
 
 def create_url_safe_token(data: dict) -> str:
     """
     Create a URL-safe token for sending in links (e.g. email verification).
     """
-    return serializer.dumps(data)
+    return serializer.dumps(data).decode("ascii")
 
 def decode_url_safe_token(token: str) -> dict | None:
     """
@@ -34,15 +34,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType,PatchSchema
     ) -> List[ModelType]:
              statement= select(self.model).offset(skip).limit(limit)
              result = await db.execute(statement)
-             obj =result.scalar()
-             return obj
+             return result.scalars().all()
 
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.model_dump()
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
 
     async def update(
@@ -52,17 +51,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType,PatchSchema
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = db_obj.__dict__
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+            update_data = {field: getattr(obj_in, field) for field in obj_in.model_fields_set}
+        for field, value in update_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj 
     
 
@@ -73,10 +71,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType,PatchSchema
       id: UUID,
       obj_in: Union[PatchSchemaType, Dict[str, Any]]
     ) -> ModelType:
-    # Build and execute the query
-      statement = select(self.model).where(self.model.id == id)
-      result = await db.execute(statement)
-      existing_obj = result.scalars().first()
+    # Callers that already loaded the row pass it in; only look it up otherwise
+      if db_obj is not None and not isinstance(db_obj, type):
+        existing_obj = db_obj
+      else:
+        statement = select(self.model).where(self.model.id == id)
+        result = await db.execute(statement)
+        existing_obj = result.scalars().first()
 
      # Handle not found
       if not existing_obj:
@@ -86,7 +87,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType,PatchSchema
         )
 
      # Extract the data to update
-      patch_data = obj_in.model_dump(exclude_unset=True)
+      if isinstance(obj_in, dict):
+        patch_data = obj_in
+      else:
+        patch_data = {field: getattr(obj_in, field) for field in obj_in.model_fields_set}
 
      # Apply patch
       for field, value in patch_data.items():
@@ -99,12 +103,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType,PatchSchema
       return existing_obj
 
     async def remove(self, db: AsyncSession, *, id: UUID) -> ModelType:
-        obj = select(self.model).where(self.model[id]==id)
+        statement = select(self.model).where(self.model.id == id)
+        result = await db.execute(statement)
+        obj = result.scalar_one_or_none()
         if not obj:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"{self.model.__name__} with id {id} not found",
             )
-        db.delete(obj)
-        db.commit()
+        await db.delete(obj)
+        await db.commit()
         return obj
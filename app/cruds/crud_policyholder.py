@@ -1,10 +1,15 @@
-from typing import Any, Dict, Optional, Union, List
+import secrets
+from typing import Any, Dict, Optional, Tuple, Union, List
 from uuid import UUID
-from sqlmodel import select, and_
+from sqlalchemy import bindparam, exists, update
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import select, and_, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 from app.cruds.base import CRUDBase
-from app.models.models import User, Policy, Claim, Notification, UserRole, ClaimStatus
+from app.cruds.crud_user import invalidate_user_caches
+from app.models.models import User, Policy, Claim, Notification, UserRole, ClaimStatus, Employer, Provider
+from app.utils.pagination import keyset_after, window_total
 from app.schemas.policyholder import (
     PolicyholderProfileUpdate,
     PolicyholderClaimCreate,
@@ -12,80 +17,181 @@ from app.schemas.policyholder import (
     PolicyholderDashboardResponse
 )
 
+PENDING_CLAIM_STATUSES = frozenset({
+    ClaimStatus.SUBMITTED, ClaimStatus.UNDER_REVIEW_CS,
+    ClaimStatus.UNDER_REVIEW_CLAIMS, ClaimStatus.PENDING_MD_APPROVAL
+})
+APPROVED_CLAIM_STATUSES = frozenset({
+    ClaimStatus.APPROVED, ClaimStatus.PARTIALLY_APPROVED, ClaimStatus.PAID
+})
+
+# Relationships stay lazy="raise" on the models; each entity's eager loads
+# are declared once here and shared by every query that returns it.
+_POLICY_LOADERS = (selectinload(Policy.employer), selectinload(Policy.provider), raiseload("*"))
+_CLAIM_LOADERS = (selectinload(Claim.policies), raiseload("*"))
+_NOTIFICATION_LOADERS = (selectinload(Notification.claim), raiseload("*"))
+
+# Fixed-shape statements are built once at import time and bound per call,
+# so requests skip statement construction and cache-key generation.
+# populate_existing: the request's current_user may already sit in the
+# identity map from the user cache, and must not shadow the fresh row.
+_PROFILE_BY_ID = (
+    select(User)
+    .where(and_(User.id == bindparam("user_id"), User.role == UserRole.POLICYHOLDER))
+    .execution_options(populate_existing=True)
+)
+
+_POLICY_BY_ID = (
+    select(Policy)
+    .where(and_(Policy.id == bindparam("policy_id"), Policy.policyholder_id == bindparam("user_id")))
+    .options(*_POLICY_LOADERS)
+)
+
+_CLAIM_BY_ID = (
+    select(Claim)
+    .join(Policy, Claim.policy_id == Policy.id)
+    .where(and_(Claim.id == bindparam("claim_id"), Policy.policyholder_id == bindparam("user_id")))
+    .options(*_CLAIM_LOADERS)
+)
+
+# Dashboard aggregates: one single-row subquery per table, cross-joined into
+# one SELECT so the summary is a single round trip on the request session
+# and each table is scanned once.
+_POLICY_COUNTS = select(
+    func.count().label("total_policies"),
+    func.count().filter(Policy.is_active == True).label("active_policies"),
+).where(Policy.policyholder_id == bindparam("user_id")).subquery()
+
+_CLAIM_STATS = (
+    select(
+        func.count().label("total_claims"),
+        func.count().filter(Claim.status.in_(PENDING_CLAIM_STATUSES)).label("pending_claims"),
+        func.count().filter(Claim.status.in_(APPROVED_CLAIM_STATUSES)).label("approved_claims"),
+        func.count().filter(Claim.status == ClaimStatus.REJECTED).label("rejected_claims"),
+        func.coalesce(
+            func.sum(Claim.approved_amount).filter(Claim.status.in_(APPROVED_CLAIM_STATUSES)), 0
+        ).label("total_approved_amount"),
+    )
+    .select_from(Claim)
+    .join(Policy, Claim.policy_id == Policy.id)
+    .where(Policy.policyholder_id == bindparam("user_id"))
+    .subquery()
+)
+
+_UNREAD_NOTIFICATIONS = select(func.count().label("unread_notifications")).where(
+    and_(Notification.user_id == bindparam("user_id"), Notification.is_read == False)
+).subquery()
+
+_DASHBOARD_SUMMARY = select(_POLICY_COUNTS, _CLAIM_STATS, _UNREAD_NOTIFICATIONS)
+
+# Version stamps for conditional GETs: row counts catch inserts and deletes,
+# max(updated_at) catches edits (kept current by the set_updated_at trigger).
+_POLICIES_VERSION = (
+    select(
+        func.count(Policy.id),
+        func.max(func.greatest(Policy.updated_at, Employer.updated_at, Provider.updated_at)),
+    )
+    .select_from(Policy)
+    .outerjoin(Employer, Employer.id == Policy.employer_id)
+    .outerjoin(Provider, Provider.id == Policy.provider_id)
+    .where(Policy.policyholder_id == bindparam("user_id"))
+)
+
+_DASHBOARD_VERSION = select(
+    select(func.count()).select_from(Policy)
+    .where(Policy.policyholder_id == bindparam("user_id")).scalar_subquery(),
+    select(func.max(Policy.updated_at))
+    .where(Policy.policyholder_id == bindparam("user_id")).scalar_subquery(),
+    select(func.count()).select_from(Claim).join(Policy, Claim.policy_id == Policy.id)
+    .where(Policy.policyholder_id == bindparam("user_id")).scalar_subquery(),
+    select(func.max(Claim.updated_at)).join(Policy, Claim.policy_id == Policy.id)
+    .where(Policy.policyholder_id == bindparam("user_id")).scalar_subquery(),
+    select(func.count()).select_from(Notification)
+    .where(Notification.user_id == bindparam("user_id")).scalar_subquery(),
+    select(func.max(Notification.updated_at))
+    .where(Notification.user_id == bindparam("user_id")).scalar_subquery(),
+)
+
 
 class CRUDPolicyholder(CRUDBase[User, None, PolicyholderProfileUpdate, None]):
     
     async def get_profile(self, db: AsyncSession, *, user_id: UUID) -> User | None:
         """Get policyholder profile by user ID"""
-        statement = select(User).where(
-            and_(User.id == user_id, User.role == UserRole.POLICYHOLDER)
-        )
-        result = await db.exec(statement)
+        result = await db.exec(_PROFILE_BY_ID, params={"user_id": user_id})
         return result.first()
     
     async def update_profile(
         self, db: AsyncSession, *, user_id: UUID, obj_in: PolicyholderProfileUpdate
     ) -> User | None:
         """Update policyholder profile"""
-        user = await self.get_profile(db, user_id=user_id)
-        if not user:
-            return None
-        
-        update_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(user, field, value)
+        update_data = {field: getattr(obj_in, field) for field in obj_in.model_fields_set}
+        if not update_data:
+            return await self.get_profile(db, user_id=user_id)
         
+        statement = (
+            update(User)
+            .where(and_(User.id == user_id, User.role == UserRole.POLICYHOLDER))
+            .values(**update_data)
+            .returning(User)
+        )
+        result = await db.execute(statement)
+        user = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(user)
+        invalidate_user_caches()
         return user
     
     async def get_policies(
         self, db: AsyncSession, *, user_id: UUID, skip: int = 0, limit: int = 100
-    ) -> List[Policy]:
-        """Get all policies for a policyholder"""
+    ) -> Tuple[List[Policy], Optional[int]]:
+        """Get a page of policies for a policyholder along with the total count"""
         statement = (
-            select(Policy)
+            select(Policy, func.count().over().label("total"))
             .where(Policy.policyholder_id == user_id)
+            .options(*_POLICY_LOADERS)
             .offset(skip)
             .limit(limit)
         )
         result = await db.exec(statement)
-        return result.all()
+        rows = result.all()
+        return [row[0] for row in rows], window_total(rows, skip)
+    
+    async def get_policies_version(self, db: AsyncSession, *, user_id: UUID) -> tuple:
+        """Count and latest change of a policyholder's policies, for ETags"""
+        result = await db.exec(_POLICIES_VERSION, params={"user_id": user_id})
+        return tuple(result.one())
     
     async def get_policy_by_id(
         self, db: AsyncSession, *, user_id: UUID, policy_id: UUID
     ) -> Policy | None:
         """Get a specific policy for a policyholder"""
-        statement = select(Policy).where(
-            and_(Policy.id == policy_id, Policy.policyholder_id == user_id)
+        result = await db.exec(
+            _POLICY_BY_ID, params={"policy_id": policy_id, "user_id": user_id}
         )
-        result = await db.exec(statement)
         return result.first()
     
     async def get_claims(
         self, db: AsyncSession, *, user_id: UUID, skip: int = 0, limit: int = 100
-    ) -> List[Claim]:
-        """Get all claims for a policyholder"""
+    ) -> Tuple[List[Claim], Optional[int]]:
+        """Get a page of claims for a policyholder along with the total count"""
         statement = (
-            select(Claim)
+            select(Claim, func.count().over().label("total"))
             .join(Policy, Claim.policy_id == Policy.id)
             .where(Policy.policyholder_id == user_id)
+            .options(*_CLAIM_LOADERS)
             .offset(skip)
             .limit(limit)
         )
         result = await db.exec(statement)
-        return result.all()
+        rows = result.all()
+        return [row[0] for row in rows], window_total(rows, skip)
     
     async def get_claim_by_id(
         self, db: AsyncSession, *, user_id: UUID, claim_id: UUID
     ) -> Claim | None:
         """Get a specific claim for a policyholder"""
-        statement = (
-            select(Claim)
-            .join(Policy, Claim.policy_id == Policy.id)
-            .where(and_(Claim.id == claim_id, Policy.policyholder_id == user_id))
+        result = await db.exec(
+            _CLAIM_BY_ID, params={"claim_id": claim_id, "user_id": user_id}
         )
-        result = await db.exec(statement)
         return result.first()
     
     async def create_claim(
@@ -93,13 +199,18 @@ class CRUDPolicyholder(CRUDBase[User, None, PolicyholderProfileUpdate, None]):
     ) -> Claim | None:
         """Create a new claim for a policyholder"""
         # Verify the policy belongs to the user
-        policy = await self.get_policy_by_id(db, user_id=user_id, policy_id=obj_in.policy_id)
-        if not policy:
+        owns_policy = await db.scalar(
+            select(
+                exists().where(
+                    and_(Policy.id == obj_in.policy_id, Policy.policyholder_id == user_id)
+                )
+            )
+        )
+        if not owns_policy:
             return None
         
         # Generate unique reference number
-        import uuid
-        reference_number = f"CLM-{uuid.uuid4().hex[:8].upper()}"
+        reference_number = f"CLM-{secrets.token_hex(4).upper()}"
         
         claim = Claim(
             reference_number=reference_number,
@@ -112,20 +223,30 @@ class CRUDPolicyholder(CRUDBase[User, None, PolicyholderProfileUpdate, None]):
         
         db.add(claim)
         await db.commit()
-        await db.refresh(claim)
-        return claim
+        return await self.get_claim_by_id(db, user_id=user_id, claim_id=claim.id)
     
     async def get_notifications(
-        self, db: AsyncSession, *, user_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Notification]:
         """Get all notifications for a policyholder"""
         statement = (
             select(Notification)
             .where(Notification.user_id == user_id)
-            .order_by(Notification.created_at.desc())
-            .offset(skip)
+            .options(*_NOTIFICATION_LOADERS)
+            .order_by(Notification.created_at.desc(), Notification.id.desc())
             .limit(limit)
         )
+        after = keyset_after(Notification.created_at, Notification.id, cursor)
+        if after is not None:
+            statement = statement.where(after)
+        else:
+            statement = statement.offset(skip)
         result = await db.exec(statement)
         return result.all()
     
@@ -133,75 +254,29 @@ class CRUDPolicyholder(CRUDBase[User, None, PolicyholderProfileUpdate, None]):
         self, db: AsyncSession, *, user_id: UUID, notification_id: UUID
     ) -> Notification | None:
         """Mark a notification as read"""
-        statement = select(Notification).where(
-            and_(Notification.id == notification_id, Notification.user_id == user_id)
+        statement = (
+            update(Notification)
+            .where(and_(Notification.id == notification_id, Notification.user_id == user_id))
+            .values(is_read=True)
+            .returning(Notification)
+            .options(*_NOTIFICATION_LOADERS)
         )
-        result = await db.exec(statement)
-        notification = result.first()
-        
-        if not notification:
-            return None
-        
-        notification.is_read = True
+        result = await db.execute(statement)
+        notification = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(notification)
         return notification
     
+    async def get_dashboard_version(self, db: AsyncSession, *, user_id: UUID) -> tuple:
+        """Counts and latest changes behind the dashboard summary, for ETags"""
+        result = await db.exec(_DASHBOARD_VERSION, params={"user_id": user_id})
+        return tuple(result.one())
+    
     async def get_dashboard_summary(
         self, db: AsyncSession, *, user_id: UUID
     ) -> PolicyholderDashboardResponse:
         """Get dashboard summary for a policyholder"""
-        # Get policies count
-        policies_statement = select(Policy).where(Policy.policyholder_id == user_id)
-        policies_result = await db.exec(policies_statement)
-        policies = policies_result.all()
-        
-        total_policies = len(policies)
-        active_policies = len([p for p in policies if p.is_active])
-        
-        # Get claims statistics
-        claims_statement = (
-            select(Claim)
-            .join(Policy, Claim.policy_id == Policy.id)
-            .where(Policy.policyholder_id == user_id)
-        )
-        claims_result = await db.exec(claims_statement)
-        claims = claims_result.all()
-        
-        total_claims = len(claims)
-        pending_claims = len([c for c in claims if c.status in [
-            ClaimStatus.SUBMITTED, ClaimStatus.UNDER_REVIEW_CS, 
-            ClaimStatus.UNDER_REVIEW_CLAIMS, ClaimStatus.PENDING_MD_APPROVAL
-        ]])
-        approved_claims = len([c for c in claims if c.status in [
-            ClaimStatus.APPROVED, ClaimStatus.PARTIALLY_APPROVED, ClaimStatus.PAID
-        ]])
-        rejected_claims = len([c for c in claims if c.status == ClaimStatus.REJECTED])
-        
-        total_approved_amount = sum([
-            c.approved_amount or 0 for c in claims 
-            if c.approved_amount and c.status in [
-                ClaimStatus.APPROVED, ClaimStatus.PARTIALLY_APPROVED, ClaimStatus.PAID
-            ]
-        ])
-        
-        # Get unread notifications count
-        notifications_statement = select(Notification).where(
-            and_(Notification.user_id == user_id, Notification.is_read == False)
-        )
-        notifications_result = await db.exec(notifications_statement)
-        unread_notifications = len(notifications_result.all())
-        
-        return PolicyholderDashboardResponse(
-            total_policies=total_policies,
-            active_policies=active_policies,
-            total_claims=total_claims,
-            pending_claims=pending_claims,
-            approved_claims=approved_claims,
-            rejected_claims=rejected_claims,
-            total_approved_amount=total_approved_amount,
-            unread_notifications=unread_notifications
-        )
+        result = await db.exec(_DASHBOARD_SUMMARY, params={"user_id": user_id})
+        return PolicyholderDashboardResponse(**result.one()._mapping)
 
 
 policyholder = CRUDPolicyholder(User)
@@ -1,5 +1,8 @@
+import time
 from typing import Any, Dict, Optional, Union, List
 from uuid import UUID
+from sqlalchemy import exists, func
+from sqlalchemy.orm import defer, load_only, raiseload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import status,HTTPException
@@ -7,19 +10,66 @@ from app.core.security import get_password_hash, verify_password
 from app.cruds.base import CRUDBase
 from app.models.models import User
 from app.schemas.user import UserCreate, UserUpdate, UserPatch
+from app.utils.cache import TTLCache
+
+# Staff lists per role change only when staff join, leave or change role.
+# Each worker may serve a list up to a minute stale.
+_role_cache = TTLCache(maxsize=32, ttl=60)
+
+# Authenticated users keyed by raw access token, held as detached instances
+# for at most 30 seconds and never past the token's exp. Every user write
+# (including role and is_active changes) clears it in this worker; other
+# workers may see such a change up to 30 seconds late.
+CURRENT_USER_TTL = 30
+_current_user_cache = TTLCache(maxsize=10000, ttl=CURRENT_USER_TTL)
+
+
+def invalidate_user_caches() -> None:
+    """Drop cached user lookups after any write to the users table."""
+    _role_cache.clear()
+    _current_user_cache.clear()
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate,UserPatch]):
     async def get_by_email(self, db: AsyncSession,email: str) -> User | None:
-      statement = select(User).filter(User.email == email)
+      statement = (
+          select(User)
+          .filter(func.lower(User.email) == email.lower())
+          .options(defer(User.hashed_password))
+      )
       result = await db.execute(statement)
       user = result.scalars().first()
       return user
 
+    async def get_current_by_token(
+        self, db: AsyncSession, *, token: str, email: str, expires_at: Optional[float] = None
+    ) -> User | None:
+        """
+        get_by_email for request authentication, cached per access token.
+        Hits are merged into db with load=False, so they cost no SELECT.
+        """
+        cached = _current_user_cache.get(token)
+        if cached is None:
+            cached = await self.get_by_email(db, email)
+            if cached is None:
+                return None
+            ttl = CURRENT_USER_TTL
+            if expires_at is not None:
+                ttl = min(ttl, expires_at - time.time())
+            # Keep a detached copy for later requests; each request works on
+            # its own merged instance.
+            db.expunge(cached)
+            _current_user_cache.set(token, cached, ttl=ttl)
+        return await db.merge(cached, load=False)
+
+    async def exists_by_email(self, db: AsyncSession, email: str) -> bool:
+        statement = select(exists().where(func.lower(User.email) == email.lower()))
+        return bool(await db.scalar(statement))
+
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
         db_obj = User(
-            email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            email=obj_in.email.lower(),
+            hashed_password=await get_password_hash(obj_in.password),
             full_name=obj_in.full_name,
             role=obj_in.role,
             is_active=True,
@@ -27,6 +77,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate,UserPatch]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        invalidate_user_caches()
         return db_obj
 
     async def update(
@@ -35,20 +86,52 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate,UserPatch]):
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = {field: getattr(obj_in, field) for field in obj_in.model_fields_set}
+        if update_data.get("email"):
+            update_data["email"] = update_data["email"].lower()
         if update_data.get("password"):
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)  
+        updated = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        invalidate_user_caches()
+        return updated
+
+    async def patch(
+        self, db: AsyncSession, db_obj: User, id: UUID, obj_in: Union[UserPatch, Dict[str, Any]]
+    ) -> User:
+        patched = await super().patch(db, db_obj=db_obj, id=id, obj_in=obj_in)
+        invalidate_user_caches()
+        return patched
+
+    async def remove(self, db: AsyncSession, *, id: UUID) -> User:
+        removed = await super().remove(db, id=id)
+        invalidate_user_caches()
+        return removed
     
     
 
     async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> User:
-        user = await self.get_by_email(db, email=email)
-        if user: 
-            
-            return user
+        # The password hash is deferred everywhere else; load it only here,
+        # together with just the columns the login response needs.
+        statement = (
+            select(User)
+            .where(func.lower(User.email) == email.lower())
+            .options(
+                load_only(
+                    User.id, User.email, User.hashed_password,
+                    User.is_active, User.role, User.full_name,
+                ),
+                raiseload("*"),
+            )
+        )
+        result = await db.execute(statement)
+        user = result.scalars().first()
+        if not user or not user.hashed_password:
+            return None
+        if not await verify_password(password, user.hashed_password):
+            return None
+        return user
 
     def is_active(self, user: User) -> bool:
         return user.is_active
@@ -56,8 +139,26 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate,UserPatch]):
     def is_admin(self, user: User) -> bool:
         return user.role == "ADMIN"
 
-    async  def get_by_role(self, db: AsyncSession, *, role: str, skip: int = 0, limit: int = 100) -> List[User]:
-        return select(User).filter(User.role == role).offset(skip).limit(limit)
+    async def get_by_role(self, db: AsyncSession, *, role: str, skip: int = 0, limit: int = 100) -> List[User]:
+        key = (role, skip, limit)
+        users = _role_cache.get(key)
+        if users is None:
+            statement = (
+                select(User)
+                .filter(User.role == role)
+                .options(load_only(User.id, User.email, User.full_name, User.role, User.is_active))
+                .offset(skip)
+                .limit(limit)
+            )
+            result = await db.execute(statement)
+            # Cache detached snapshots so no request session's instances are
+            # shared with later requests.
+            users = [
+                User(id=u.id, email=u.email, full_name=u.full_name, role=u.role, is_active=u.is_active)
+                for u in result.scalars().all()
+            ]
+            _role_cache.set(key, users)
+        return list(users)
 
 
 user = CRUDUser(User)
@@ -1,13 +1,13 @@
-from datetime import datetime
 import os
 from typing import Any, Dict, List, Optional
 
 from alembic.config import Config
 from alembic import command
-from sqlalchemy.orm import Session 
+from sqlalchemy import exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import SQLModel
 
-from app.db.session import Base, async_engine
+from app.db.session import async_engine
 from app.core.config import settings
 from app.models.models import User, UserRole
 from app.core.security import get_password_hash
@@ -116,17 +116,22 @@ async def init_db() -> None:
         command.stamp(alembic_cfg, "head")
 
 
-def create_initial_data(db: Session) -> None:
-    admin = db.query(User).filter(User.email == "ssako@faabsystems.com").first()
-    if not admin:
-        admin_user = User(
-            email="ssako@faabsystems.com",
-            hashed_password=get_password_hash("admin123"),
+async def create_initial_data() -> None:
+    admin_email = "ssako@faabsystems.com"
+    async with async_engine.begin() as conn:
+        # Skip the bcrypt hash entirely on warm databases.
+        admin_exists = await conn.scalar(
+            select(exists().where(func.lower(User.email) == admin_email))
+        )
+        if admin_exists:
+            return
+
+        # ON CONFLICT makes seeding atomic when several workers boot at once.
+        statement = pg_insert(User).values(
+            email=admin_email,
+            hashed_password=await get_password_hash("admin123"),
             full_name="Admin User",
             role=UserRole.ADMIN,
             is_active=True,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-        )
-        db.add(admin_user)
-        db.commit()
+        ).on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+        await conn.execute(statement)
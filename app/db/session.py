@@ -1,16 +1,67 @@
-from sqlmodel import SQLModel,create_engine
-from sqlalchemy.ext.asyncio import AsyncEngine
+import logging
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 
-async_engine = AsyncEngine(create_engine(url=settings.DATABASE_URL))
+logger = logging.getLogger(__name__)
+
+connect_args = {}
+if make_url(settings.DATABASE_URL).get_driver_name() == "asyncpg":
+    if settings.DB_PGBOUNCER:
+        # In transaction pooling consecutive statements can land on different
+        # server connections, so named prepared statements must not be reused
+        # or cached; give each one a unique name instead.
+        connect_args = {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    else:
+        # Keep parsed/planned statements around on both the SQLAlchemy adapter
+        # and the asyncpg connection so repeated CRUD queries skip PARSE.
+        connect_args = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args=connect_args,
+    echo=False,
+)
+
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def log_pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    logger.debug("DB pool checkout: %s", async_engine.pool.status())
+
+
+async_session = sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 async def get_db():
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
+    async with async_session() as db:
+        yield db
+
 
-    async with Session() as db:
-        yield db
\ No newline at end of file
+def get_session_factory():
+    """
+    Session factory for work that outlives the request session, such as
+    background tasks. Overridable alongside get_db.
+    """
+    return async_session
@@ -1,25 +1,37 @@
 from datetime import datetime, date
+import enum
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, Float, DateTime, Date, Enum, JSON
-from typing import List, Optional,Dict
-from sqlmodel import Column, Field, Relationship, SQLModel,select,String
 import sqlalchemy.dialects.postgresql as pg
-from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import DDL, JSON, Enum, FetchedValue, Index, event, func, text
+from sqlmodel import Column, Field, Relationship, SQLModel
 
-# Define enum values as strings for better compatibility
-class UserRole:
+from app.utils.ids import uuid7
+
+
+class StrEnum(str, enum.Enum):
+    """
+    String-valued enum stored as a native Postgres ENUM (plain VARCHAR on
+    other dialects).
+    Members compare equal to (and format as) their plain string values.
+    """
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class UserRole(StrEnum):
     POLICYHOLDER = "POLICYHOLDER"
     HR = "HR"
     CUSTOMER_SERVICE = "CUSTOMER_SERVICE"
     CLAIMS = "CLAIMS"
     MD = "MD"
     FINANCE = "FINANCE"
-    ADMIN = "ADMIN" 
+    ADMIN = "ADMIN"
     USER = "USER"
 
-class ClaimStatus:
+class ClaimStatus(StrEnum):
     SUBMITTED = "SUBMITTED"
     UNDER_REVIEW_CS = "UNDER_REVIEW_CS"
     UNDER_REVIEW_CLAIMS = "UNDER_REVIEW_CLAIMS"
@@ -30,32 +42,32 @@ class ClaimStatus:
     PENDING_PAYMENT = "PENDING_PAYMENT"
     PAID = "PAID"
 
-class ReviewType:
+class ReviewType(StrEnum):
     CUSTOMER_SERVICE = "CUSTOMER_SERVICE"
     CLAIMS = "CLAIMS"
     MD = "MD"
 
-class ReviewDecision:
+class ReviewDecision(StrEnum):
     APPROVED = "APPROVED"
     PARTIALLY_APPROVED = "PARTIALLY_APPROVED"
     REJECTED = "REJECTED"
     NEEDS_MORE_INFO = "NEEDS_MORE_INFO"
 
-class ReviewItemStatus:
+class ReviewItemStatus(StrEnum):
     APPROVED = "APPROVED"
     REJECTED = "REJECTED"
 
-class PaymentStatus:
+class PaymentStatus(StrEnum):
     SCHEDULED = "SCHEDULED"
     PROCESSED = "PROCESSED"
     FAILED = "FAILED"
 
-class NotificationType:
+class NotificationType(StrEnum):
     EMAIL = "EMAIL"
     SMS = "SMS"
     IN_APP = "IN_APP"
 
-class AuditAction:
+class AuditAction(StrEnum):
     CREATE = "CREATE"
     READ = "READ"
     UPDATE = "UPDATE"
@@ -70,212 +82,321 @@ class AuditAction:
 
 class User(SQLModel,table=True):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+    )
 
     id : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     email : Optional[str] = Field(default=None,nullable=False )
     hashed_password: Optional[str] = Field(default=None)
     full_name: Optional[str] = Field(default=None)
-    role: Optional[str] = Field(default=None)
+    role: Optional[UserRole] = Field(default=None, sa_column=Column(Enum(UserRole, name="user_role", native_enum=True), nullable=True))
     is_active : bool = Field( default=True)
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at : datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
     # Relationships
-    policies:"Policy" = Relationship(back_populates="policyholder",sa_relationship_kwargs={"lazy": "selectin"})
-    reviews:"Review" = Relationship(back_populates="reviewer",sa_relationship_kwargs={"lazy": "selectin"})
-    payments:"Payment" = Relationship(back_populates="processed_by",sa_relationship_kwargs={"lazy": "selectin"})
-    notifications:"Notification" = Relationship(back_populates="user",sa_relationship_kwargs={"lazy": "selectin"})
-    audit_logs:"AuditLog" = Relationship(back_populates="user",sa_relationship_kwargs={"lazy": "selectin"})
+    policies:"Policy" = Relationship(back_populates="policyholder",sa_relationship_kwargs={"lazy": "raise"})
+    reviews:"Review" = Relationship(back_populates="reviewer",sa_relationship_kwargs={"lazy": "raise"})
+    payments:"Payment" = Relationship(back_populates="processed_by",sa_relationship_kwargs={"lazy": "raise"})
+    notifications:"Notification" = Relationship(back_populates="user",sa_relationship_kwargs={"lazy": "raise"})
+    audit_logs:"AuditLog" = Relationship(back_populates="user",sa_relationship_kwargs={"lazy": "raise"})
 
 class Employer(SQLModel,table=True):
     __tablename__ = "employers"
+    __mapper_args__ = {"eager_defaults": True}
 
     id : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     name :str = Field(default=None,nullable=False )
     contact_person :str = Field(default=None,nullable=False )
     contact_email  :str = Field(default=None,nullable=False )
     contact_phone  :str = Field(default=None,nullable=False )
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    policies:"Policy" = Relationship(back_populates="employer",sa_relationship_kwargs={"lazy": "selectin"})
+    policies:"Policy" = Relationship(back_populates="employer",sa_relationship_kwargs={"lazy": "raise"})
 
 class Policy(SQLModel,table=True):
     __tablename__ = "policies"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_policies_policyholder_id", "policyholder_id"),
+        Index("ix_policies_member_number", "member_number", unique=True),
+    )
 
     id  : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
-    member_number :str = Field(default=None,unique=True,nullable=False )
+    member_number :str = Field(default=None,nullable=False )
     plan_type  :str = Field(default=None,nullable=False ) 
     policyholder_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None)
-    employer_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="employers.id",default=None)
-    provider_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="providers.id",default=None)
+    employer_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="employers.id",default=None, index=True)
+    provider_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="providers.id",default=None, index=True)
     start_date: datetime = Field(default_factory=datetime.now)
     end_date: datetime = Field(default_factory=datetime.now)
     is_active: bool = Field( default=True)
-    created_at:datetime = Field(default_factory=datetime.now)
-    updated_at:datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    policyholder:User = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "selectin"})
-    employer:"Employer" = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "selectin"})
-    provider:"Provider" = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "selectin"})
-    claims:"Claim" = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "selectin"})
+    policyholder:User = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "raise"})
+    employer:"Employer" = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "raise"})
+    provider:"Provider" = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "raise"})
+    claims:"Claim" = Relationship(back_populates="policies",sa_relationship_kwargs={"lazy": "raise"})
 
 class Claim(SQLModel,table=True):
     __tablename__ = "claims"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_claims_policy_id_status", "policy_id", "status"),
+        Index("ix_claims_reference_number", "reference_number", unique=True),
+        Index("ix_claims_created_at_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_claims_status_created_at", "status", text("created_at DESC"), text("id DESC")),
+    )
 
     id   : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
-    reference_number:str = Field(unique=True, nullable=False)
+    reference_number:str = Field(nullable=False)
     policy_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="policies.id",default=None)
     hospital_pharmacy:str = Field(nullable=False)
     reason:str = Field(nullable=False)
     requested_amount:float= Field(nullable=False)
     approved_amount:float = Field(nullable=True)
-    status:str = Field(nullable=False, default=ClaimStatus.SUBMITTED)
-    submission_date:datetime = Field(default=datetime.now)
-    created_at:datetime = Field(default_factory=datetime.now)
-    updated_at:datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    status: ClaimStatus = Field(default=ClaimStatus.SUBMITTED, sa_column=Column(Enum(ClaimStatus, name="claim_status", native_enum=True), nullable=False))
+    submission_date: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    policies:Policy = Relationship(back_populates="claims",sa_relationship_kwargs={"lazy": "selectin"})
-    attachments:"ClaimAttachment" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "selectin"})
-    reviews:"Review" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "selectin"})
-    payments:"Payment" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "selectin"})
-    notifications:"Notification" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "selectin"})
+    policies:Policy = Relationship(back_populates="claims",sa_relationship_kwargs={"lazy": "raise"})
+    attachments:"ClaimAttachment" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "raise"})
+    reviews:"Review" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "raise"})
+    payments:"Payment" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "raise"})
+    notifications:"Notification" = Relationship(back_populates="claim",sa_relationship_kwargs={"lazy": "raise"})
 
 class ClaimAttachment(SQLModel,table=True):
     __tablename__ = "claim_attachments"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_claim_attachments_claim_id_sha256", "claim_id", "sha256"),
+    )
 
     id  : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
-    claim_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None)
+    claim_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None, index=True)
     file_name:str = Field(nullable=False)
     file_path:str = Field(nullable=False)
     file_type:str = Field(nullable=False)
-    uploaded_at:datetime = Field(default=datetime.now)
+    sha256:Optional[str] = Field(default=None, nullable=True)
+    uploaded_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
 
     # Relationships
-    claim:Claim = Relationship(back_populates="attachments",sa_relationship_kwargs={"lazy": "selectin"})
+    claim:Claim = Relationship(back_populates="attachments",sa_relationship_kwargs={"lazy": "raise"})
 
 class Review(SQLModel,table=True):
     __tablename__ = "reviews"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_reviews_claim_id_review_type", "claim_id", "review_type"),
+    )
 
     id  : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     claim_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None)
-    reviewer_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None)
-    review_type:str = Field(nullable=False)
+    reviewer_id:Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None, index=True)
+    review_type: ReviewType = Field(sa_column=Column(Enum(ReviewType, name="review_type", native_enum=True), nullable=False))
     comments:str = Field(nullable=True)
-    decision:str = Field(nullable=False)
+    decision: ReviewDecision = Field(sa_column=Column(Enum(ReviewDecision, name="review_decision", native_enum=True), nullable=False))
     rejection_reason:str = Field(nullable=True)
     reviewed_at:datetime = Field(default_factory=datetime.now)
-    created_at:datetime = Field(default_factory=datetime.now)
-    updated_at:datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    claim: Claim= Relationship(back_populates="reviews",sa_relationship_kwargs={"lazy": "selectin"})
-    reviewer:User = Relationship(back_populates="reviews",sa_relationship_kwargs={"lazy": "selectin"})
-    review_items:"ReviewItem" = Relationship(back_populates="review",sa_relationship_kwargs={"lazy": "selectin"})
+    claim: Claim= Relationship(back_populates="reviews",sa_relationship_kwargs={"lazy": "raise"})
+    reviewer:User = Relationship(back_populates="reviews",sa_relationship_kwargs={"lazy": "raise"})
+    review_items:"ReviewItem" = Relationship(back_populates="review",sa_relationship_kwargs={"lazy": "raise"})
 
 class ReviewItem(SQLModel,table=True):
     __tablename__ = "review_items"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_review_items_review_id_status", "review_id", "status"),
+    )
 
     id : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     review_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="reviews.id",default=None)
     item_name:str = Field(nullable=False)
     requested_amount:float = Field(nullable=False)
     approved_amount:float = Field(nullable=False)
-    status:str = Field(nullable=False)
+    status: ReviewItemStatus = Field(sa_column=Column(Enum(ReviewItemStatus, name="review_item_status", native_enum=True), nullable=False))
     rejection_reason:str = Field(nullable=True)
-    created_at:datetime = Field(default_factory=datetime.now)
-    updated_at:str = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    review:Review = Relationship(back_populates="review_items",sa_relationship_kwargs={"lazy": "selectin"})
+    review:Review = Relationship(back_populates="review_items",sa_relationship_kwargs={"lazy": "raise"})
 
 class Payment(SQLModel,table=True):
     __tablename__ = "payments"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
-    claim_id  :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None)
+    claim_id  :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None, index=True)
     invoice_number:str = Field(nullable=False)
     payment_amount:float = Field(nullable=False)
     payment_date:date = Field(nullable=False)
-    payment_status:str = Field(nullable=False, default=PaymentStatus.SCHEDULED)
-    processed_by_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None)
-    created_at:datetime = Field(default_factory=datetime.now)
-    updated_at:datetime = Field(default_factory=datetime.now,sa_column_kwargs={"onupdate": datetime.now})
+    payment_status: PaymentStatus = Field(default=PaymentStatus.SCHEDULED, sa_column=Column(Enum(PaymentStatus, name="payment_status", native_enum=True), nullable=False))
+    processed_by_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None, index=True)
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    claim:Claim = Relationship(back_populates="payments",sa_relationship_kwargs={"lazy": "selectin"})
-    processed_by:User = Relationship(back_populates="payments",sa_relationship_kwargs={"lazy": "selectin"})
+    claim:Claim = Relationship(back_populates="payments",sa_relationship_kwargs={"lazy": "raise"})
+    processed_by:User = Relationship(back_populates="payments",sa_relationship_kwargs={"lazy": "raise"})
 
 class Notification(SQLModel,table=True):
     __tablename__ = "notifications"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_notifications_user_id_unread", "user_id", postgresql_where=text("is_read = false")),
+        Index(
+            "ix_notifications_user_id_created_at",
+            "user_id", text("created_at DESC"), text("id DESC"),
+            postgresql_include=["title", "is_read", "notification_type"],
+        ),
+    )
 
     id : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     user_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None)
-    claim_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None)
+    claim_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="claims.id",default=None, index=True)
     title:str = Field(nullable=False)
     message:str = Field(nullable=False)
-    notification_type:str = Field(nullable=False)
+    notification_type: NotificationType = Field(sa_column=Column(Enum(NotificationType, name="notification_type", native_enum=True), nullable=False))
     is_read:bool = Field(default=False)
-    created_at:datetime = Field(default_factory=datetime.now)
-    updated_at:datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    user:User = Relationship(back_populates="notifications",sa_relationship_kwargs={"lazy": "selectin"})
-    claim:Claim = Relationship(back_populates="notifications",sa_relationship_kwargs={"lazy": "selectin"})
+    user:User = Relationship(back_populates="notifications",sa_relationship_kwargs={"lazy": "raise"})
+    claim:Claim = Relationship(back_populates="notifications",sa_relationship_kwargs={"lazy": "raise"})
 
 class AuditLog(SQLModel,table=True):
     __tablename__ = "audit_logs"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index(
+            "ix_audit_logs_user_id_created_at",
+            "user_id", text("created_at DESC"), text("id DESC"),
+            postgresql_include=["action", "entity_type"],
+        ),
+        Index("ix_audit_logs_created_at", "created_at"),
+        Index("ix_audit_logs_details", "details", postgresql_using="gin"),
+    )
 
     id  : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     user_id :Optional[uuid.UUID] =  Field( nullable=True, foreign_key="users.id",default=None)
-    action:str = Field(nullable=False)
+    action: AuditAction = Field(sa_column=Column(Enum(AuditAction, name="audit_action", native_enum=True), nullable=False))
     entity_type:str = Field(nullable=False)
-    entity_id :Optional[uuid.UUID] =  Field( nullable=True,default=None)
-    details:str = Field(sa_column=Column(JSON, nullable=False))
+    entity_id :Optional[uuid.UUID] =  Field( nullable=True,default=None, index=True)
+    details: Dict[str, Any] = Field(
+        sa_column=Column(JSON().with_variant(pg.JSONB(), "postgresql"), nullable=False)
+    )
     ip_address:str = Field(nullable=True)
-    created_at:datetime= Field(default_factory=datetime.now)
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
 
     # Relationships
-    user:User = Relationship(back_populates="audit_logs",sa_relationship_kwargs={"lazy": "selectin"})
+    user:User = Relationship(back_populates="audit_logs",sa_relationship_kwargs={"lazy": "raise"})
 
 
 
 class Provider(SQLModel,table=True):
     __tablename__ = "providers"
+    __mapper_args__ = {"eager_defaults": True}
 
     id : uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid7)
     )
     name :str = Field(default=None,nullable=False )
     contact_person :str = Field(default=None,nullable=False )
     contact_email  :str = Field(default=None,nullable=False, unique=True )
     contact_phone  :str = Field(default=None,nullable=False )
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "server_onupdate": FetchedValue()})
 
     # Relationships
-    policies:List["Policy"] = Relationship(back_populates="provider",sa_relationship_kwargs={"lazy": "selectin"})
+    policies:List["Policy"] = Relationship(back_populates="provider",sa_relationship_kwargs={"lazy": "raise"})
+
+
+# updated_at is maintained by a BEFORE UPDATE trigger rather than in Python.
+UPDATED_AT_TABLES = [
+    User, Employer, Policy, Claim, Review, ReviewItem, Payment, Notification, Provider
+]
+
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ "
+        "BEGIN NEW.updated_at = now(); RETURN NEW; END $$ LANGUAGE plpgsql"
+    ).execute_if(dialect="postgresql"),
+)
+
+for model in UPDATED_AT_TABLES:
+    event.listen(
+        model.__table__,
+        "after_create",
+        DDL(
+            "CREATE TRIGGER %(table)s_set_updated_at BEFORE UPDATE ON %(table)s "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        ).execute_if(dialect="postgresql"),
+    )
 
 
+# claims.approved_amount is the sum of the latest reviewed items, kept in
+# step by an AFTER trigger on review_items instead of by the route handlers.
+SYNC_CLAIM_APPROVED_AMOUNT_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION sync_claim_approved_amount() RETURNS trigger AS $$ "
+    "BEGIN "
+    "UPDATE claims SET approved_amount = ("
+    "SELECT COALESCE(SUM(ri.approved_amount), 0) FROM review_items ri WHERE ri.review_id = r.id"
+    ") FROM reviews r "
+    "WHERE claims.id = r.claim_id AND r.id IN ("
+    "CASE WHEN TG_OP <> 'INSERT' THEN OLD.review_id END, "
+    "CASE WHEN TG_OP <> 'DELETE' THEN NEW.review_id END"
+    "); "
+    "RETURN NULL; "
+    "END $$ LANGUAGE plpgsql"
+)
+
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL(SYNC_CLAIM_APPROVED_AMOUNT_FUNCTION).execute_if(dialect="postgresql"),
+)
+
+event.listen(
+    ReviewItem.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER review_items_sync_claim_approved_amount "
+        "AFTER INSERT OR DELETE OR UPDATE OF review_id, approved_amount ON review_items "
+        "FOR EACH ROW EXECUTE FUNCTION sync_claim_approved_amount()"
+    ).execute_if(dialect="postgresql"),
+)
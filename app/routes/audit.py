@@ -2,12 +2,13 @@ from typing import Any, List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status 
+from fastapi import APIRouter, Depends, HTTPException, Response, status 
 from sqlmodel.ext.asyncio.session import AsyncSession 
 from sqlalchemy.orm import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import desc 
 from app.db.session import get_db 
+from app.utils.pagination import keyset_after, next_cursor, window_total
 
 from app.models.models import User, AuditLog, AuditAction 
 from sqlmodel import select
@@ -30,11 +31,13 @@ access_token_bearer = AccessTokenBearer(auto_error=True)
 
 @router.get("", response_model=List[dict])
 async def get_audit_logs(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[UUID] = None,
-    action_type: Optional[str] = None,
+    action_type: Optional[AuditAction] = None,
     entity_type: Optional[str] = None,
     entity_id: Optional[UUID] = None,
     start_date: Optional[datetime] = None,
@@ -43,8 +46,9 @@ async def get_audit_logs(
 ) -> Any:
   
 
-    # Build the base query
-    query = select(AuditLog)
+    # Build the base query; the window count carries the match total on
+    # every row of the page, so no separate COUNT round trip is needed
+    query = select(AuditLog, func.count().over().label("total"))
     
     # Apply filters if provided
     if user_id:
@@ -61,23 +65,40 @@ async def get_audit_logs(
         query = query.filter(AuditLog.created_at <= end_date)
     
     # Order by timestamp descending
-    query = query.order_by(desc(AuditLog.created_at))
-
-    # ✅ Correct: execute count separately
-    total_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(total_query)
-    total_count = total_result.scalar()
-
-    # ✅ Correct: paginate and execute the main query
-    result = await db.execute(query.offset(skip).limit(limit))
-    audit_logs = result.scalars().all()
+    query = query.order_by(desc(AuditLog.created_at), desc(AuditLog.id))
+
+    # Seek past the cursor when given; fall back to OFFSET otherwise
+    try:
+        after = keyset_after(AuditLog.created_at, AuditLog.id, cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    page_query = query.where(after) if after is not None else query.offset(skip)
+
+    result = await db.execute(page_query.limit(limit))
+    rows = result.all()
+    audit_logs = [row[0] for row in rows]
+    # Behind a cursor the window only counts the rows past it, so the
+    # overall total is reported on offset pages only
+    total = window_total(rows, skip) if after is None else None
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    next_page = next_cursor(audit_logs, limit)
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+
+    # Fetch every acting user for the page in one IN query
+    user_ids = {log.user_id for log in audit_logs if log.user_id}
+    users = {}
+    if user_ids:
+        user_result = await db.execute(
+            select(User.id, User.full_name, User.email).where(User.id.in_(user_ids))
+        )
+        users = {row.id: row for row in user_result}
 
     # Convert to dicts
     final_result = []
     for log in audit_logs:
-        # Fetch user separately
-        user_result = await db.execute(select(User).filter(User.id == log.user_id))
-        user = user_result.scalar_one_or_none()
+        user = users.get(log.user_id)
 
         user_name = user.full_name if user else "Unknown"
         user_email = user.email if user else "Unknown"
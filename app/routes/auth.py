@@ -1,13 +1,13 @@
-from datetime import timedelta
-from typing import Any
+from typing import Any, Callable
 from sqlmodel import select
-from fastapi import APIRouter, Body, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.core import deps 
 from app.core.deps import AccessTokenBearer
-from app.db.session import get_db 
+from app.db.session import get_db, get_session_factory 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 from app.core.security import get_password_hash,decode_url_safe_token,create_url_safe_token,create_access_token
@@ -18,11 +18,13 @@ from app.schemas.user import User as UserSchema, UserCreate
 from app.utils.audit import audit_service 
 from app.core.config import Settings 
 from app.utils.notification import NotificationService 
+from app.utils.cache import TTLCache
 
 
 
 access_token_bearer = AccessTokenBearer()
 send_notification_emails = NotificationService.send_email_notification 
+password_reset_sent = TTLCache(maxsize=10000, ttl=60)
 
 router = APIRouter() 
 
@@ -30,7 +32,9 @@ router = APIRouter()
 async def login_access_token(
     request: Request,
     form_data: Login,
-    db: AsyncSession = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory)
 ) -> Any:
  
     """
@@ -49,30 +53,30 @@ async def login_access_token(
             status_code=status.HTTP_400_BAD_REQUEST, 
         )
     
+    user_id = str(user.id)
+
     # Log successful login
-    await  audit_service.log_login(
-        db=db,
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_login,
+        session_factory=session_factory,
         user_id= user.id,
         ip_address=request.client.host if request.client else None,
         details={"email": user.email}
     )
-    access_token_expires = timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS)
-    refresh=False
-    return {
+    return ORJSONResponse(content={
         "access_token": create_access_token(
             user_data={"email":user.email,
-                       "id":str(user.id)},
-                        expiry= access_token_expires,
-                        refresh=refresh                 
+                       "id":user_id},
         ), 
-        "user": {"id":user.id,
+        "user": {"id":user_id,
                  "email":user.email,
                  "full_name":user.full_name,
                  "is_active":user.is_active,
                  "role":user.role
                  },
         "token_type": "bearer"
-    }
+    })
 
 
 @router.post("/refresh", response_model=Token)
@@ -83,39 +87,46 @@ async def refresh_token(
     """
     Refresh access token
     """
-    access_token_expires = timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS)
-    refresh=False
-    return {
+    return ORJSONResponse(content={
         "access_token": create_access_token(
             user_data={"email":current_user.email,
-                       "id":str(current_user.id)}, 
-                       expiry=access_token_expires,
-                       refresh=refresh
+                       "id":str(current_user.id)},
         ),
         "token_type": "bearer",
-    }
+    })
 
 @router.post("/register")
 async def register_user(
     request: Request,
+    background_tasks: BackgroundTasks,
     *,
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     user_in: UserCreate
 ) -> Any:
     """
     Register a new user (policyholder)
     """
-    user = await user_crud.get_by_email(db, email=user_in.email)
-    if user == True:
+    if await user_crud.exists_by_email(db, email=user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system",
         ) 
-    user = await user_crud.create(db, obj_in=user_in)
+    try:
+        user = await user_crud.create(db, obj_in=user_in)
+    except IntegrityError:
+        # A concurrent registration won the race on the unique email index.
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The user with this email already exists in the system",
+        )
     
     # Log user creation
-    await audit_service.log_create(
-        db=db,
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_create,
+        session_factory=session_factory,
         user_id=user.id,
         entity_type="User",
         entity_id=user.id,
@@ -127,11 +138,26 @@ async def register_user(
 
 
 @router.post("/password-reset-request")
-async def password_reset_request(user_data: PasswordResetRequestModel,db:Session=Depends(get_db)):
+async def password_reset_request(
+    user_data: PasswordResetRequestModel,
+    background_tasks: BackgroundTasks,
+    db:Session=Depends(get_db)
+):
      email = user_data.email
+     reset_response = JSONResponse(
+        content={
+            "message": "Please check your email for instructions to reset your password",
+        },
+        status_code=status.HTTP_200_OK,
+    )
+
+     # A reset mail already went out for this address in the last minute.
+     cache_key = f"pwreset:{email.lower()}"
+     if cache_key in password_reset_sent:
+         return reset_response
+     password_reset_sent.set(cache_key, True)
      
      token = create_url_safe_token({"email": email})
-     print(email)
 
      link = f"https://{settings.DOMAIN}/api/v1/auth/password-reset-confirm/{token}"
 
@@ -141,13 +167,13 @@ async def password_reset_request(user_data: PasswordResetRequestModel,db:Session
         """
      subject = "Reset Your Password"
 
-     await send_notification_emails( subject, html_message,[email],)
-     return JSONResponse(
-        content={
-            "message": "Please check your email for instructions to reset your password",
-        },
-        status_code=status.HTTP_200_OK,
-    )
+     background_tasks.add_task(
+         send_notification_emails,
+         to_email=email,
+         subject=subject,
+         html_content=html_message,
+     )
+     return reset_response
 
 
 @router.post("/password-reset-confirm/{token}")
@@ -174,7 +200,7 @@ async def reset_account_password(
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-        passwd_hash = get_password_hash(new_password)
+        passwd_hash = await get_password_hash(new_password)
         user.hashed_password= passwd_hash
         await db.commit()
 
@@ -0,0 +1,79 @@
+import asyncio
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from starlette.routing import Match
+
+from app.core.deps import AccessTokenBearer
+from app.schemas.batch import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+
+router = APIRouter()
+access_token_bearer = AccessTokenBearer()
+
+ALLOWED_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+
+
+async def _dispatch(client: httpx.AsyncClient, item: BatchRequestItem) -> BatchResponseItem:
+    response = await client.request(item.method.upper(), item.url, json=item.body)
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+    else:
+        body = response.text or None
+    return BatchResponseItem(id=item.id, status=response.status_code, body=body)
+
+
+def _routes_to_batch(request: Request, url: str) -> bool:
+    """
+    Whether url would be routed to this endpoint. The path is decoded and
+    normalised the way the sub-request will see it, then resolved against
+    the app's routes, so encoded or dotted variants of the path are caught.
+    """
+    path = posixpath.normpath(unquote(urlsplit(url).path))
+    scope = {"type": "http", "path": path, "root_path": "", "method": "POST"}
+    for route in request.app.router.routes:
+        if getattr(route, "endpoint", None) is not batch:
+            continue
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return True
+    return False
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    request: Request,
+    batch_in: BatchRequest,
+    _: dict = Depends(access_token_bearer)
+):
+    """
+    Run several API calls in one HTTP round-trip. Each sub-request is
+    dispatched concurrently through the app with the caller's credentials.
+    """
+    for item in batch_in.requests:
+        if item.method.upper() not in ALLOWED_METHODS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported method in batch request {item.id}",
+            )
+        if (
+            not item.url.startswith("/")
+            or item.url.startswith("//")
+            or _routes_to_batch(request, item.url)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid url in batch request {item.id}",
+            )
+
+    headers = {"authorization": request.headers["authorization"]}
+    transport = httpx.ASGITransport(app=request.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=str(request.base_url), headers=headers
+    ) as client:
+        responses = await asyncio.gather(
+            *(_dispatch(client, item) for item in batch_in.requests)
+        )
+
+    return BatchResponse(responses=responses)
@@ -1,14 +1,22 @@
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, UploadFile, File, Form 
+from fastapi import APIRouter, Depends, HTTPException, Response, status, BackgroundTasks, UploadFile, File, Form 
+from sqlalchemy import delete, exists, insert
+from sqlalchemy.orm import raiseload, selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+import asyncio
+import hashlib
 import uuid
 import os
+import secrets
+
+import aiofiles
+import aiofiles.os
 
 from app.core import deps 
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
 from app.models.models import User, Claim, ClaimStatus, UserRole,Policy,ClaimAttachment,ReviewItem,Review,Payment,Employer
 from app.cruds.crud_user import user as user_crud
 from app.utils.notification import notification_service
@@ -16,6 +24,8 @@ from app.core.config import settings
 from app.core.deps import AccessTokenBearer 
 from app.cruds.base import CRUDBase
 from app.schemas.claim import ClaimPatch,ClaimCreate,ClaimResponse,AttachmentPatch
+from app.utils.cache import TTLCache
+from app.utils.pagination import keyset_after, next_cursor
 
 
 access_token_bearer = AccessTokenBearer(auto_error=True)
@@ -23,49 +33,121 @@ base = CRUDBase(Claim)
 bases = CRUDBase(ClaimAttachment)
 router = APIRouter()
 
-@router.get("", response_model=List[dict])
+# Recent claim list pages keyed by query parameters. Dashboards poll the same
+# filters, so a short TTL absorbs repeats. Every route that writes claims or
+# their reviews and payments clears it outright.
+claims_list_cache = TTLCache(maxsize=256, ttl=15)
+
+# Uploads are copied in fixed-size chunks so memory stays bounded per request.
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024
+
+
+async def _write_upload(upload: UploadFile, filepath: str) -> str:
+    """
+    Stream an uploaded file to disk without reading it into memory whole.
+    Returns the SHA-256 hex digest of the content, hashed as it streams.
+    """
+    digest = hashlib.sha256()
+    async with aiofiles.open(filepath, "wb") as f:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            await f.write(chunk)
+    return digest.hexdigest()
+
+
+def _new_filename(orig: Optional[str]) -> str:
+    """
+    Random on-disk name for an upload, keeping the original extension.
+    """
+    name = uuid.uuid4().hex
+    _, dot, ext = (orig or "").rpartition(".")
+    return f"{name}.{ext}" if dot and ext else name
+
+
+async def _save_attachment(upload: UploadFile, claim_id: UUID) -> dict:
+    """
+    Write one upload under a fresh name and return its claim_attachments row.
+    """
+    filename = _new_filename(upload.filename)
+    filepath = os.path.join(settings.UPLOAD_DIRECTORY, filename)
+    sha256 = await _write_upload(upload, filepath)
+    return {
+        "claim_id": claim_id,
+        "file_name": upload.filename,
+        "file_path": filepath,
+        "file_type": upload.content_type,
+        "sha256": sha256,
+    }
+
+
+async def _reuse_stored_copies(rows: List[dict], stored: Dict[str, str]) -> None:
+    """
+    Point rows whose content is already on disk (by digest, in stored) at the
+    existing file and remove the copy just written.
+    """
+    for row in rows:
+        existing = stored.setdefault(row["sha256"], row["file_path"])
+        if existing != row["file_path"]:
+            await aiofiles.os.remove(row["file_path"])
+            row["file_path"] = existing
+
+@router.get("", response_model=List[ClaimResponse])
 async def get_claims(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    status: Optional[ClaimStatus] = None,
+    current_user: User = Depends(deps.get_current_user),
     _: dict = Depends(access_token_bearer)
 ) -> Any:
     """
-    Get list of claims based on user role
+    Get list of claims based on user role.
+    Pass the X-Next-Cursor header back as `cursor` to fetch the next page.
     """
-    query = select(Claim)
+    # Pages are cached per caller, so no scoping applied to one user's page
+    # can reach another. Writes clear the cache in this worker only; other
+    # workers may serve a page up to the cache TTL (15s) stale.
+    cache_key = (current_user.role, current_user.id, skip, limit, cursor, status)
+    cached = claims_list_cache.get(cache_key)
+    if cached is not None:
+        claims, next_page = cached
+        if next_page:
+            response.headers["X-Next-Cursor"] = next_page
+        return claims
+
+    query = (
+        select(Claim)
+        .options(raiseload("*"))
+        .order_by(Claim.created_at.desc(), Claim.id.desc())
+    )
 
     
     if status:
         query = query.filter(Claim.status == status)
+
+    try:
+        after = keyset_after(Claim.created_at, Claim.id, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    query = query.where(after) if after is not None else query.offset(skip)
     
-    result = await db.execute(query.offset(skip).limit(limit))
-    claims = result.scalars().all()
-
-    response = []
-    for claim in claims:
-        response.append({
-            "id": claim.id,
-            "reference_number": claim.reference_number,
-            "hospital_pharmacy": claim.hospital_pharmacy,
-            "reason": claim.reason,
-            "requested_amount": claim.requested_amount,
-            "approved_amount": claim.approved_amount,
-            "status": claim.status,
-            "submission_date": claim.submission_date,
-            "policy_id": claim.policy_id,
-            "created_at": claim.created_at,
-            "updated_at": claim.updated_at,
-        })
-    
-    return response
+    result = await db.execute(query.limit(limit))
+    rows = result.scalars().all()
+    next_page = next_cursor(rows, limit)
+    claims = [ClaimResponse.model_validate(row) for row in rows]
+    claims_list_cache.set(cache_key, (claims, next_page))
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    return claims
 
 
 @router.post("", response_model=dict)
 async def create_claim(
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     policy_id: str = Form(...),
     hospital_pharmacy: str = Form(...),
     reason: str = Form(...),
@@ -90,7 +172,7 @@ async def create_claim(
     
     
     # Generate unique reference number
-    reference_number = f"CLM-{uuid.uuid4().hex[:8].upper()}"
+    reference_number = f"CLM-{secrets.token_hex(4).upper()}"
     
     # Create claim
     claim = Claim(
@@ -107,24 +189,15 @@ async def create_claim(
     
     # Save attachments if provided
     if attachments:
-        os.makedirs(settings.UPLOAD_DIRECTORY, exist_ok=True)
-        
-        for attachment in attachments:
-            filename = f"{uuid.uuid4()}{os.path.splitext(attachment.filename)[1]}"
-            filepath = os.path.join(settings.UPLOAD_DIRECTORY, filename)
-            
-            with open(filepath, "wb") as f:
-                f.write(await attachment.read())
-            
-            claim_attachment = ClaimAttachment(
-                claim_id=claim.id,
-                file_name=attachment.filename,
-                file_path=filepath,
-                file_type=attachment.content_type,
-            )
-            db.add(claim_attachment)
+        rows = await asyncio.gather(
+            *(_save_attachment(attachment, claim.id) for attachment in attachments)
+        )
+        await _reuse_stored_copies(rows, {})
+        # One executemany INSERT, no per-object unit-of-work bookkeeping.
+        await db.execute(insert(ClaimAttachment), rows)
     
     await db.commit()
+    claims_list_cache.clear()
     await db.refresh(claim)
     
     # Fetch users for notification
@@ -137,6 +210,7 @@ async def create_claim(
     
     await notification_service.notify_claim_submission(
         background_tasks=background_tasks,
+        session_factory=session_factory,
         db=db,
         claim=claim,
         policyholder=policyholder,
@@ -161,7 +235,26 @@ async def get_claim(
     """
     Get claim by ID
     """
-    result = await db.execute(select(Claim).where(Claim.id == claim_id))
+    # One statement plus a batched IN query per relationship, instead of a
+    # query per review, review's items, reviewer and payment processor.
+    statement = (
+        select(Claim)
+        .where(Claim.id == claim_id)
+        .options(
+            selectinload(Claim.policies).options(
+                selectinload(Policy.policyholder),
+                selectinload(Policy.employer),
+            ),
+            selectinload(Claim.attachments),
+            selectinload(Claim.reviews).options(
+                selectinload(Review.review_items),
+                selectinload(Review.reviewer),
+            ),
+            selectinload(Claim.payments).selectinload(Payment.processed_by),
+            raiseload("*"),
+        )
+    )
+    result = await db.execute(statement)
     claim = result.scalar_one_or_none()
 
     if not claim:
@@ -170,14 +263,8 @@ async def get_claim(
             detail="Claim not found",
         )
 
-    # Check permissions
-    result = await db.execute(select(Policy).where(Policy.id == claim.policy_id))
-    policy = result.scalar_one_or_none()
-   
+    policy = claim.policies
 
-    # Get attachments
-    result = await db.execute(select(ClaimAttachment).where(ClaimAttachment.claim_id == claim.id))
-    attachments = result.scalars().all()
     attachment_list = [
         {
             "id": a.id,
@@ -185,16 +272,11 @@ async def get_claim(
             "file_type": a.file_type,
             "uploaded_at": a.uploaded_at,
         }
-        for a in attachments
+        for a in claim.attachments
     ]
 
-    # Get reviews and review items
-    result = await db.execute(select(Review).where(Review.claim_id == claim.id))
-    reviews = result.scalars().all()
     review_list = []
-    for review in reviews:
-        result = await db.execute(select(ReviewItem).where(ReviewItem.review_id == review.id))
-        items = result.scalars().all()
+    for review in claim.reviews:
         item_list = [
             {
                 "id": item.id,
@@ -204,11 +286,10 @@ async def get_claim(
                 "status": item.status,
                 "rejection_reason": item.rejection_reason,
             }
-            for item in items
+            for item in review.review_items
         ]
 
-        result = await db.execute(select(User).where(User.id == review.reviewer_id))
-        reviewer = result.scalar_one_or_none()
+        reviewer = review.reviewer
         reviewer_name = reviewer.full_name if reviewer else "Unknown"
 
         review_list.append({
@@ -222,13 +303,9 @@ async def get_claim(
             "items": item_list
         })
 
-    # Get payments
-    result = await db.execute(select(Payment).where(Payment.claim_id == claim.id))
-    payments = result.scalars().all()
     payment_list = []
-    for payment in payments:
-        result = await db.execute(select(User).where(User.id == payment.processed_by_id))
-        processor = result.scalar_one_or_none()
+    for payment in claim.payments:
+        processor = payment.processed_by
         processor_name = processor.full_name if processor else "Unknown"
 
         payment_list.append({
@@ -241,11 +318,8 @@ async def get_claim(
             "created_at": payment.created_at
         })
 
-    # Get policyholder and employer
-    result = await db.execute(select(User).where(User.id == policy.policyholder_id))
-    policyholder = result.scalar_one_or_none()
-    result = await db.execute(select(Employer).where(Employer.id == policy.employer_id))
-    employer = result.scalar_one_or_none()
+    policyholder = policy.policyholder
+    employer = policy.employer
 
     return {
         "id": claim.id,
@@ -283,17 +357,14 @@ async def get_claim(
 async def update_claim_status(
     claim_id: UUID,
     background_tasks: BackgroundTasks,
-    status: str = Form(...),
+    status: ClaimStatus = Form(...),
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     _: dict = Depends(access_token_bearer)
 ) -> Any:
     """
     Update claim status
     """
-    # Check if status is valid
-    if status not in [s for s in dir(ClaimStatus) if not s.startswith("__")]:
-        return {"detail":"Invalid status"}
-
     # Fetch the claim
     result = await db.execute(select(Claim).filter(Claim.id == claim_id))
     claim = result.scalar_one_or_none()
@@ -304,14 +375,15 @@ async def update_claim_status(
 
     # Update claim status
     claim.status = status
-    db.commit()
-    db.refresh(claim)
+    await db.commit()
+    claims_list_cache.clear()
+    await db.refresh(claim)
 
     # Fetch policy and policyholder
     result = await db.execute(select(Policy).filter(Policy.id == claim.policy_id))
     policy = result.scalar_one_or_none()
     if not policy:
-        raise {"detail":"Policy not found"}
+        raise HTTPException(status_code=404, detail="Policy not found")
 
     result = await db.execute(select(User).filter(User.id == policy.policyholder_id))
     policyholder = result.scalar_one_or_none()
@@ -319,6 +391,7 @@ async def update_claim_status(
     # Send notification
     await notification_service.notify_claim_status_update(
         background_tasks=background_tasks,
+        session_factory=session_factory,
         db=db,
         claim=claim,
         policyholder=policyholder,
@@ -356,24 +429,21 @@ _: dict = Depends(access_token_bearer)
             detail="Claim not found",
         )
 
-    # Create upload directory if it doesn't exist
-    os.makedirs(settings.UPLOAD_DIRECTORY, exist_ok=True)
+    # Save file to disk under a unique name
+    row = await _save_attachment(attachment, claim_id)
 
-    # Generate unique filename
-    filename = f"{uuid.uuid4()}{os.path.splitext(attachment.filename)[1]}"
-    filepath = os.path.join(settings.UPLOAD_DIRECTORY, filename)
-
-    # Save file to disk
-    with open(filepath, "wb") as f:
-        f.write(await attachment.read())
+    # Reuse the stored file if this claim already has identical content
+    result = await db.execute(
+        select(ClaimAttachment.file_path)
+        .where(ClaimAttachment.claim_id == claim_id, ClaimAttachment.sha256 == row["sha256"])
+        .limit(1)
+    )
+    existing_path = result.scalar_one_or_none()
+    if existing_path:
+        await _reuse_stored_copies([row], {row["sha256"]: existing_path})
 
     # Save attachment record
-    claim_attachment = ClaimAttachment(
-        claim_id=claim_id,
-        file_name=attachment.filename,
-        file_path=filepath,
-        file_type=attachment.content_type,
-    )
+    claim_attachment = ClaimAttachment(**row)
     db.add(claim_attachment)
     await db.commit()
     await db.refresh(claim_attachment)
@@ -396,38 +466,39 @@ async def delete_attachment(
     """
     Delete attachment
     """
-    # Fetch claim
-    result = await db.execute(select(Claim).filter(Claim.id == claim_id))
-    claim = result.scalar_one_or_none()
-    if not claim:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Claim not found",
-        )
-
-
-    # Fetch attachment
+    # One DELETE ... RETURNING both checks the attachment belongs to the claim
+    # and removes it.
     result = await db.execute(
-        select(ClaimAttachment).filter(
+        delete(ClaimAttachment)
+        .where(
             ClaimAttachment.id == attachment_id,
             ClaimAttachment.claim_id == claim_id,
         )
+        .returning(ClaimAttachment.file_path)
     )
-    attachment = result.scalar_one_or_none()
+    file_path = result.scalar_one_or_none()
 
-    if not attachment:
+    if file_path is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attachment not found",
         )
+    await db.commit()
 
-    # Delete file if exists
-    if os.path.exists(attachment.file_path):
-        os.remove(attachment.file_path)
+    # Duplicate uploads share one file; keep it while any record points at it
+    still_used = await db.scalar(
+        select(exists().where(
+            ClaimAttachment.claim_id == claim_id,
+            ClaimAttachment.file_path == file_path,
+        ))
+    )
 
-    # Delete record
-    await db.delete(attachment)
-    await db.commit()
+    # Delete file if exists, off the event loop
+    if not still_used:
+        try:
+            await aiofiles.os.remove(file_path)
+        except FileNotFoundError:
+            pass
 
     return {
         "message": "Attachment deleted successfully"
@@ -441,7 +512,7 @@ async def patch_claim(
     _: dict = Depends(access_token_bearer)
 ) -> Any:
    
-    statement = select(Claim).where(Claim.id== claim_id)
+    statement = select(Claim).where(Claim.id== claim_id).options(raiseload("*")).limit(1)
     result = await db.exec(statement) 
     claim = result.first()
     if not claim:
@@ -450,6 +521,7 @@ async def patch_claim(
             detail="Claim not found",
         )
     claim = await base.patch(db,db_obj=claim,obj_in=claim_in,id=claim_id)
+    claims_list_cache.clear()
     return claim 
 
 @router.patch("/{claim_id}/attachments/{attachment_id}")
@@ -460,7 +532,7 @@ async def patch_attachment(
     _: dict = Depends(access_token_bearer)
 ) -> Any:
    
-    statement = select(ClaimAttachment).where(ClaimAttachment.id== attachment_id)
+    statement = select(ClaimAttachment).where(ClaimAttachment.id== attachment_id).limit(1)
     result = await db.exec(statement) 
     attachment = result.first()
     if not attachment:
@@ -468,5 +540,5 @@ async def patch_attachment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Attachment not found",
         )
-    attachment = await bases.patch(db,db_obj=ClaimAttachment,obj_in=attachment_in,id=attachment_id)
+    attachment = await bases.patch(db,db_obj=attachment,obj_in=attachment_in,id=attachment_id)
     return attachment
\ No newline at end of file
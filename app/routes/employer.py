@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends,status,Request
 from fastapi.exceptions import HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete, update
+from sqlalchemy.orm import raiseload
 from sqlmodel import select
 from app.db.session import get_db 
 import uuid
 from app.core.deps import AccessTokenBearer,get_current_user
 from typing import List,Optional,Any  
 from app.cruds.base import CRUDBase
+from app.utils.cache import TTLCache
 from app.models.models import Employer,User
 from app.schemas.employer import (
     EmployerCreate,
@@ -20,6 +23,9 @@ router = APIRouter()
 access_token_bearer = AccessTokenBearer()
 base = CRUDBase(Employer)
 
+# Recent employer list results keyed by filter values; writes below clear it.
+employer_list_cache = TTLCache(maxsize=128, ttl=15)
+
 
 @router.post("") 
 async def create_employer(
@@ -32,6 +38,7 @@ async def create_employer(
     db.add(new_employer)
         
     await db.commit()
+    employer_list_cache.clear()
 
     await db.refresh(new_employer)
 
@@ -40,8 +47,8 @@ async def create_employer(
 
 
 
-@router.get("")
-async def get_employer(
+@router.get("", response_model=List[EmployerResponse])
+async def get_employers(
     name :Optional[str]=None,
     contact_person:Optional[str]=None,
     contact_email:Optional[str]=None,
@@ -49,7 +56,12 @@ async def get_employer(
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(access_token_bearer)
     ):
-      query = select(Employer)
+      cache_key = (name, contact_person, contact_email, contact_phone)
+      cached = employer_list_cache.get(cache_key)
+      if cached is not None:
+        return cached
+
+      query = select(Employer).options(raiseload("*"))
       if name:
         query = query.filter(Employer.name == name) 
       
@@ -63,7 +75,8 @@ async def get_employer(
         query = query.filter(Employer.contact_phone == contact_phone) 
 
       result = await db.execute(query)
-      Employers= result.scalars().all()
+      Employers= [EmployerResponse.model_validate(row) for row in result.scalars().all()]
+      employer_list_cache.set(cache_key, Employers)
       return Employers
 
 @router.get("/{resource_id}")
@@ -72,7 +85,7 @@ async def get_employer(
     db: AsyncSession = Depends(get_db), 
     _: dict = Depends(access_token_bearer)
     ):
-     statement = select(Employer).where(Employer.id== resource_id)
+     statement = select(Employer).where(Employer.id== resource_id).options(raiseload("*")).limit(1)
      result = await db.exec(statement)
      employer = result.first()
 
@@ -87,16 +100,21 @@ async def update_employer(
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(access_token_bearer) 
     ): 
-      statement = select(Employer).where(Employer.id== resource_id)
-      result = await db.exec(statement)
-      employer_to_update = result.first()
+      # PUT replaces the whole resource, so every field is written.
+      employer_to_update_dict = employer_data.model_dump()
+
+      # Single UPDATE ... RETURNING instead of SELECT, UPDATE and refresh.
+      statement = (
+            update(Employer)
+            .where(Employer.id== resource_id)
+            .values(**employer_to_update_dict)
+            .returning(Employer)
+      )
+      result = await db.execute(statement)
+      employer_to_update = result.scalar_one_or_none()
       if employer_to_update is not None:
-            employer_to_update_dict = employer_data.model_dump()
-            for k, v in employer_to_update_dict.items():
-                setattr(employer_to_update, k, v)
             await db.commit()
-            await db.refresh(employer_to_update)
-
+            employer_list_cache.clear()
             return employer_to_update
       else:
             return None 
@@ -107,11 +125,12 @@ async def delete_employer(
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(access_token_bearer)
    ):
-      statement = select(Employer).where(Employer.id== resource_id)
-      result = await db.exec(statement)
-      employer_to_delete = result.first()
-      if employer_to_delete :
+      statement = delete(Employer).where(Employer.id== resource_id).returning(Employer.id)
+      result = await db.execute(statement)
+      deleted_id = result.scalar_one_or_none()
+      if deleted_id is not None:
          await db.commit()
+         employer_list_cache.clear()
          return {}
       else:
        
@@ -125,7 +144,7 @@ async def patch_employer(
     _: dict = Depends(access_token_bearer)
 ) -> Any:
    
-    statement = select(Employer).where(Employer.id== resource_id)
+    statement = select(Employer).where(Employer.id== resource_id).limit(1)
     result = await db.exec(statement) 
     employer = result.first()
     if not employer:
@@ -133,5 +152,6 @@ async def patch_employer(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employer not found",
         )
-    Item = await base.patch(db,db_obj=Employer,obj_in=resource_in,id=resource_id)
+    Item = await base.patch(db,db_obj=employer,obj_in=resource_in,id=resource_id)
+    employer_list_cache.clear()
     return Item
\ No newline at end of file
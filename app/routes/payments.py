@@ -1,16 +1,20 @@
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 from uuid import UUID
 from datetime import date
 from app.core.deps import AccessTokenBearer
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Form
+from fastapi import APIRouter, Depends, HTTPException, Response, status, BackgroundTasks, Form
+from fastapi.responses import ORJSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession 
-from app.db.session import get_db 
-from sqlmodel import select
+from app.db.session import get_db, get_session_factory
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import func, select
 from app.core import deps 
 from app.cruds.base import CRUDBase
 from app.schemas.payments import PaymentCreate, PaymentResponse, PaymentPatch
 from app.models.models import User, Claim, Payment, PaymentStatus, ClaimStatus, UserRole,Policy
+from app.routes.claims import claims_list_cache
 from app.utils.notification import notification_service
+from app.utils.pagination import window_total
 
 base = CRUDBase(Payment)
 router = APIRouter() 
@@ -19,17 +23,37 @@ access_token_bearer = AccessTokenBearer()
 
 @router.get("", response_model=List[dict])
 async def get_payments(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     claim_id: Optional[UUID] = None,
-    payment_status: Optional[str] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    current_user: User = Depends(deps.get_current_user),
     _: dict = Depends(access_token_bearer)
 ) -> Any:
     """
     Get list of payments
     """
-    query = select(Payment)
+    # One statement returns each payment with its claim reference,
+    # processor name and the overall match count; no follow-up queries.
+    query = (
+        select(
+            Payment,
+            Claim.reference_number,
+            User.full_name,
+            func.count().over().label("total"),
+        )
+        .outerjoin(Claim, Claim.id == Payment.claim_id)
+        .outerjoin(User, User.id == Payment.processed_by_id)
+    )
+
+    # Policyholders only see payments on claims against their own policies;
+    # the inner Policy join drops payments without a matching claim here.
+    if current_user.role == UserRole.POLICYHOLDER:
+        query = query.join(Policy, Policy.id == Claim.policy_id).where(
+            Policy.policyholder_id == current_user.id
+        )
 
     if claim_id:
         query = query.filter(Payment.claim_id == claim_id)
@@ -40,32 +64,23 @@ async def get_payments(
 
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
-    payments = result.scalars().all()
+    rows = result.all()
+    total = window_total(rows, skip)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
 
     payment_list = []
-    for payment in payments:
-        # Get processor name
-        processor = None
-        if payment.processed_by_id:
-            processor_result = await db.execute(select(User).where(User.id == payment.processed_by_id))
-            processor = processor_result.scalar_one_or_none()
-        processor_name = processor.full_name if processor else "Unknown"
-
-        # Get claim reference number
-        claim_result = await db.execute(select(Claim).where(Claim.id == payment.claim_id))
-        claim = claim_result.scalar_one_or_none()
-        claim_reference = claim.reference_number if claim else "Unknown"
-
+    for payment, claim_reference, processor_name, _total in rows:
         payment_list.append({
             "id": payment.id,
             "claim_id": payment.claim_id,
-            "claim_reference": claim_reference,
+            "claim_reference": claim_reference or "Unknown",
             "invoice_number": payment.invoice_number,
             "payment_amount": payment.payment_amount,
             "payment_date": payment.payment_date,
             "payment_status": payment.payment_status,
             "processed_by_id": payment.processed_by_id,
-            "processor_name": processor_name,
+            "processor_name": processor_name or "Unknown",
             "created_at": payment.created_at,
             "updated_at": payment.updated_at,
         })
@@ -80,14 +95,22 @@ async def create_payment(
     payment_amount: float = Form(...),
     payment_date: date = Form(...),
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     current_user: User = Depends(deps.get_current_user), 
     _: dict = Depends(access_token_bearer)
 ) -> Any:
     """
     Create a new payment for a claim
     """
-    # Check if claim exists
-    result = await db.execute(select(Claim).filter(Claim.id == claim_id))
+    # Fetch the claim together with its policy and policyholder
+    result = await db.execute(
+        select(Claim)
+        .where(Claim.id == claim_id)
+        .options(
+            selectinload(Claim.policies).selectinload(Policy.policyholder),
+            raiseload("*"),
+        )
+    )
     claim = result.scalar_one_or_none()
     if not claim:
         raise HTTPException(
@@ -102,6 +125,14 @@ async def create_payment(
             detail="Claim must be approved or partially approved to create payment",
         )
 
+    policy = claim.policies
+    if not policy:
+        raise HTTPException(status_code=404, detail="Policy not found.")
+
+    policyholder = policy.policyholder
+    if not policyholder:
+        raise HTTPException(status_code=404, detail="Policyholder not found.")
+
     # Create payment
     payment = Payment(
         claim_id=claim_id,
@@ -111,30 +142,17 @@ async def create_payment(
         payment_status=PaymentStatus.SCHEDULED,
         processed_by_id=current_user.id,
     )
+    # Stage the payment and the claim status change in one transaction
     db.add(payment)
-    await db.commit()
-    await db.refresh(payment)
-
-    # Update claim status
     claim.status = ClaimStatus.PENDING_PAYMENT
     await db.commit()
-    await db.refresh(claim)
-
-    # Fetch policy
-    result = await db.execute(select(Policy).filter(Policy.id == claim.policy_id))
-    policy = result.scalar_one_or_none()
-    if not policy:
-        raise HTTPException(status_code=404, detail="Policy not found.")
-
-    # Fetch policyholder
-    result = await db.execute(select(User).filter(User.id == policy.policyholder_id))
-    policyholder = result.scalar_one_or_none()
-    if not policyholder:
-        raise HTTPException(status_code=404, detail="Policyholder not found.")
+    await db.refresh(payment)
+    claims_list_cache.clear()
 
     # Send notification
     await notification_service.notify_payment_scheduled(
         background_tasks=background_tasks,
+        session_factory=session_factory,
         db=db,
         claim=claim,
         policyholder=policyholder,
@@ -161,8 +179,18 @@ async def get_payment(
     """
     Get payment by ID
     """
-    # Fetch payment
-    result = await db.execute(select(Payment).where(Payment.id == payment_id))
+    # Fetch payment with its claim, policyholder and processor in one go
+    result = await db.execute(
+        select(Payment)
+        .where(Payment.id == payment_id)
+        .options(
+            selectinload(Payment.claim)
+            .selectinload(Claim.policies)
+            .selectinload(Policy.policyholder),
+            selectinload(Payment.processed_by),
+            raiseload("*"),
+        )
+    )
     payment = result.scalar_one_or_none()
     
     if not payment:
@@ -170,38 +198,15 @@ async def get_payment(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Payment not found",
         )
-    
-    # Check permissions
-    
-    # policy_result = await db.execute(select(Policy).where(Policy.id == claim.policy_id))
-    # policy = policy_result.scalar_one_or_none()
-    
-    # Fetch processor
-    processor_name = "Unknown"
-    if payment.processed_by_id:
-        processor_result = await db.execute(select(User).where(User.id == payment.processed_by_id))
-        processor = processor_result.scalar_one_or_none()
-        if processor:
-            processor_name = processor.full_name
-
-    # Fetch claim for claim reference
-    claim_reference = "Unknown"
-    policyholder_name = "Unknown"
-    if payment.claim_id:
-        claim_result = await db.execute(select(Claim).where(Claim.id == payment.claim_id))
-        claim = claim_result.scalar_one_or_none()
-        
-        if claim:
-            claim_reference = claim.reference_number
-
-            # Fetch policy and policyholder
-            policy_result = await db.execute(select(Policy).where(Policy.id == claim.policy_id))
-            policy = policy_result.scalar_one_or_none()
-            if policy:
-                policyholder_result = await db.execute(select(User).where(User.id == policy.policyholder_id))
-                policyholder = policyholder_result.scalar_one_or_none()
-                if policyholder:
-                    policyholder_name = policyholder.full_name
+
+    processor = payment.processed_by
+    processor_name = processor.full_name if processor else "Unknown"
+
+    claim = payment.claim
+    policy = claim.policies if claim else None
+    policyholder = policy.policyholder if policy else None
+    claim_reference = claim.reference_number if claim else "Unknown"
+    policyholder_name = policyholder.full_name if policyholder else "Unknown"
 
     result = {
         "id": payment.id,
@@ -218,7 +223,9 @@ async def get_payment(
         "updated_at": payment.updated_at
     }
 
-    return result
+    # Plain dict of UUID/date/enum values: let orjson encode it directly
+    # rather than running it through response_model validation first.
+    return ORJSONResponse(content=result)
 
 
 @router.put("/{payment_id}", response_model=dict)
@@ -228,8 +235,9 @@ async def update_payment(
     invoice_number: Optional[str] = Form(None),
     payment_amount: Optional[float] = Form(None),
     payment_date: Optional[date] = Form(None),
-    payment_status: Optional[str] = Form(None),
+    payment_status: Optional[PaymentStatus] = Form(None),
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
      _: dict = Depends(access_token_bearer)
  
 ) -> Any:
@@ -238,8 +246,7 @@ async def update_payment(
     """
 
     # Get the payment
-    result = await db.execute(select(Payment).filter(Payment.id == payment_id))
-    payment = result.scalar_one_or_none()
+    payment = await db.get(Payment, payment_id)
 
     if not payment:
         raise HTTPException(
@@ -266,13 +273,13 @@ async def update_payment(
     if payment_status:
         payment.payment_status = payment_status
 
+    # eager_defaults fetches updated_at in the UPDATE's RETURNING clause,
+    # so no refresh is needed after the commit.
     await db.commit()
-    await db.refresh(payment)
 
     # Update claim if necessary
     if payment_status:
-        result = await db.execute(select(Claim).filter(Claim.id == payment.claim_id))
-        claim = result.scalar_one_or_none()
+        claim = await db.get(Claim, payment.claim_id)
         if not claim:
             raise HTTPException(status_code=404, detail="Claim not found")
 
@@ -280,16 +287,15 @@ async def update_payment(
             claim.status = ClaimStatus.PAID
             await db.commit()
             await db.refresh(claim)
+            claims_list_cache.clear()
 
             # Notify policyholder
-            result = await db.execute(select(Policy).filter(Policy.id == claim.policy_id))
-            policy = result.scalar_one_or_none()
-
-            result = await db.execute(select(User).filter(User.id == policy.policyholder_id))
-            policyholder = result.scalar_one_or_none()
+            policy = await db.get(Policy, claim.policy_id)
+            policyholder = await db.get(User, policy.policyholder_id)
 
             await notification_service.notify_claim_status_update(
                 background_tasks=background_tasks,
+                session_factory=session_factory,
                 db=db,
                 claim=claim,
                 policyholder=policyholder,
@@ -312,13 +318,12 @@ async def patch_payment(
     _: dict = Depends(access_token_bearer)
 ) -> Any:
    
-    statement = select(Payment).where(Payment.id== payment_id)
-    result = await db.exec(statement) 
-    payment = result.first()
+    payment = await db.get(Payment, payment_id)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Payment not found",
         )
     payment = await base.patch(db,db_obj=payment,obj_in=payment_in,id=payment_id)
+    claims_list_cache.clear()
     return payment
\ No newline at end of file
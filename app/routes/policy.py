@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends,status,Request
+from fastapi import APIRouter, Depends,status,Request,Query
 from fastapi.exceptions import HTTPException 
+from fastapi.responses import ORJSONResponse
+import secrets
 import uuid
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from app.db.session import get_db 
 from app.core.deps import AccessTokenBearer
 from app.core.deps import get_current_user
 from typing import List,Optional 
-from app.cruds.base import CRUDBase
 from app.models.models import Policy,User
 from app.schemas.policy import (
     PolicyCreate,
@@ -15,10 +18,11 @@ from app.schemas.policy import (
     PolicyPatch,
     PolicyResponse 
 )
-base = CRUDBase(Policy)
 router = APIRouter()
 access_token_bearer = AccessTokenBearer()
 
+# Fresh member numbers to try before giving up on unique-index collisions.
+MEMBER_NUMBER_ATTEMPTS = 3
 
 
 @router.post("") 
@@ -28,26 +32,38 @@ async def create_policy(
    
     _: dict = Depends(access_token_bearer)
     ): 
-    # Generate unique member number
-    member_number = f"MEM-{uuid.uuid4().hex[:7].upper()}"
     policy_to_dict = resource_data.model_dump()
-    new_policy = Policy(** policy_to_dict) 
 
-    new_policy.member_number = member_number 
+    for attempt in range(MEMBER_NUMBER_ATTEMPTS):
+        # Random member number; the unique index settles any collision
+        member_number = f"MEM-{secrets.token_hex(4).upper()}"
 
-    db.add(new_policy)
-        
-    await db.commit()
-
-    await db.refresh(new_policy)
+        # Single INSERT ... RETURNING instead of INSERT followed by a refresh.
+        statement = (
+            insert(Policy)
+            .values(**policy_to_dict, member_number=member_number)
+            .returning(Policy)
+        )
+        try:
+            result = await db.execute(statement)
+            new_policy = result.scalar_one()
+            await db.commit()
+        except IntegrityError as exc:
+            await db.rollback()
+            collided = "ix_policies_member_number" in str(exc.orig)
+            if not collided or attempt == MEMBER_NUMBER_ATTEMPTS - 1:
+                raise
+            continue
 
-    return new_policy
+        return new_policy
 
 
 
 
 @router.get("")
-async def get_policy(
+async def get_policies(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
     plan_type :Optional[str]=None,
     start_date:Optional[str]=None,
     end_date:Optional[str]=None,
@@ -68,9 +84,13 @@ async def get_policy(
       if is_active:
         query = query.where(Policy.is_active == is_active) 
 
-      result = await db.exec(query)
+      # ids are UUIDv7, so primary-key order is creation order.
+      query = query.order_by(Policy.id.desc()).offset(skip).limit(limit)
 
-      return result
+      # Materialise the page here instead of handing FastAPI a live Result
+      # to iterate after the session has closed.
+      result = await db.exec(query)
+      return result.all()
 
 @router.get("/{resource_id}")
 async def get_policy(
@@ -78,11 +98,13 @@ async def get_policy(
     db: AsyncSession = Depends(get_db),
    _: dict = Depends(access_token_bearer)
     ):
-     statement = select(Policy).where(Policy.id== resource_id)
-     result = await db.exec(statement)
-     policy = result.first()
+     policy = await db.get(Policy, resource_id)
+     if policy is None:
+          return None
 
-     return policy if policy is not None else None 
+     # orjson encodes the UUID and datetime fields natively, so skip
+     # FastAPI's jsonable_encoder pass over the model.
+     return ORJSONResponse(content=policy.model_dump())
 
 
 
@@ -93,16 +115,17 @@ async def update_policy(
       db: AsyncSession = Depends(get_db),
       _: dict = Depends(access_token_bearer)
       ): 
-      statement = select(Policy).where(Policy.id== resource_id)
-      result = await db.exec(statement)
-      policy_to_update = result.first()
+      # Single UPDATE ... RETURNING instead of SELECT, UPDATE and refresh.
+      statement = (
+            update(Policy)
+            .where(Policy.id== resource_id)
+            .values(**policy_data.model_dump())
+            .returning(Policy)
+      )
+      result = await db.execute(statement)
+      policy_to_update = result.scalar_one_or_none()
       if policy_to_update is not None:
-            policy_to_update_dict = policy_data.model_dump()
-            for k, v in policy_to_update_dict.items():
-                setattr(policy_to_update, k, v)
             await db.commit()
-            await db.refresh(policy_to_update)
-
             return policy_to_update
       else:
             return None 
@@ -115,27 +138,36 @@ async def patch_policy(
     _: dict = Depends(access_token_bearer)
   ):
    
-    statement = select(Policy).where(Policy.id== resource_id)
-    result = await db.exec(statement)
-    policy = result.first()
-    if policy is not None:
+    policy_in_dict = policy_in.model_dump(exclude_unset=True)
+    if policy_in_dict:
+      # Existence check and update in one UPDATE ... RETURNING.
+      statement = (
+            update(Policy)
+            .where(Policy.id== resource_id)
+            .values(**policy_in_dict)
+            .returning(Policy)
+      )
+      result = await db.execute(statement)
+      policy = result.scalar_one_or_none()
+    else:
+      policy = await db.get(Policy, resource_id)
+
+    if policy is None:
       raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Policy not found",
         )
-    policy = await base.patch(db,db_obj=policy,obj_in=policy_in,id=resource_id)
+    await db.commit()
     return policy
 
 
 @router.delete("/{resource_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_policy(
-    resource_id: str,
+    resource_id: uuid.UUID,
     db: AsyncSession = Depends(get_db), 
    _: dict = Depends(access_token_bearer)
     ):
-      statement = select(Policy).where(Policy.id== resource_id)
-      result = await db.exec(statement)
-      policy_to_delete = result.first()
+      policy_to_delete = await db.get(Policy, resource_id)
       if policy_to_delete is not None:
         await db.delete(policy_to_delete)
         await db.commit()
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List, Optional
+from typing import Callable, List, Optional
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_db, get_session_factory
 from app.core.deps import AccessTokenBearer, get_current_active_user
 from app.models.models import User, UserRole
 from app.cruds.crud_policyholder import policyholder
+from app.routes.claims import claims_list_cache
 from app.schemas.policyholder import (
     PolicyholderProfileResponse,
     PolicyholderProfileUpdate,
@@ -18,6 +19,8 @@ from app.schemas.policyholder import (
     PolicyholderDashboardResponse
 )
 from app.utils.audit import audit_service
+from app.utils.etag import etag_matches, weak_etag
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
 access_token_bearer = AccessTokenBearer()
@@ -40,23 +43,42 @@ async def get_current_policyholder(
 @router.get("/dashboard", response_model=PolicyholderDashboardResponse)
 async def get_dashboard(
     request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
 ):
     """
     Get dashboard summary for the current policyholder
     """
+    # Log dashboard access; ahead of the ETag check so 304s are audited too
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_read,
+        session_factory=session_factory,
+        user_id=current_user.id,
+        entity_type="Dashboard",
+        entity_id=current_user.id,
+        ip_address=request.client.host if request.client else None,
+    )
+
+    version = await policyholder.get_dashboard_version(db, user_id=current_user.id)
+    etag = weak_etag("dashboard", current_user.id, *version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     dashboard_data = await policyholder.get_dashboard_summary(db, user_id=current_user.id)
     
-    # Log dashboard access
-    
     return dashboard_data
 
 
 @router.get("/profile", response_model=PolicyholderProfileResponse)
 async def get_profile(
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
@@ -70,6 +92,13 @@ async def get_profile(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
+
+    # Built from the row just loaded: current_user may come from the
+    # cross-request user cache and lag behind a write on another worker.
+    etag = weak_etag("profile", profile.id, profile.updated_at)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     
     return profile
 
@@ -77,8 +106,10 @@ async def get_profile(
 @router.put("/profile", response_model=PolicyholderProfileResponse)
 async def update_profile(
     request: Request,
+    background_tasks: BackgroundTasks,
     profile_data: PolicyholderProfileUpdate,
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
 ):
@@ -95,8 +126,10 @@ async def update_profile(
         )
     
     # Log profile update
-    await audit_service.log_update(
-        db=db,
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_update,
+        session_factory=session_factory,
         user_id=current_user.id,
         entity_type="User",
         entity_id=current_user.id,
@@ -110,38 +143,43 @@ async def update_profile(
 @router.get("/policies", response_model=List[PolicyholderPolicyResponse])
 async def get_policies(
     request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
 ):
     """
     Get all policies for the current policyholder
     """
-    policies = await policyholder.get_policies(
+    # Log policy list access; ahead of the ETag check so 304s are audited too
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_read,
+        session_factory=session_factory,
+        user_id=current_user.id,
+        entity_type="Policy",
+        ip_address=request.client.host if request.client else None,
+        details={"skip": skip, "limit": limit},
+    )
+
+    version = await policyholder.get_policies_version(db, user_id=current_user.id)
+    etag = weak_etag("policies", current_user.id, skip, limit, *version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    policies, total = await policyholder.get_policies(
         db, user_id=current_user.id, skip=skip, limit=limit
     )
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     
     
-    # Transform policies to include related data
-    policy_responses = []
-    for policy in policies:
-        policy_response = PolicyholderPolicyResponse(
-            id=policy.id,
-            member_number=policy.member_number,
-            plan_type=policy.plan_type,
-            start_date=policy.start_date,
-            end_date=policy.end_date,
-            is_active=policy.is_active,
-            created_at=policy.created_at,
-            updated_at=policy.updated_at,
-            employer_name=policy.employer.name if policy.employer else None,
-            provider_name=policy.provider.name if policy.provider else None
-        )
-        policy_responses.append(policy_response)
-    
-    return policy_responses
+    return [PolicyholderPolicyResponse.model_validate(policy) for policy in policies]
 
 
 @router.get("/policies/{policy_id}", response_model=PolicyholderPolicyResponse)
@@ -164,23 +202,13 @@ async def get_policy(
             detail="Policy not found"
         )
     
-    return PolicyholderPolicyResponse(
-        id=policy.id,
-        member_number=policy.member_number,
-        plan_type=policy.plan_type,
-        start_date=policy.start_date,
-        end_date=policy.end_date,
-        is_active=policy.is_active,
-        created_at=policy.created_at,
-        updated_at=policy.updated_at,
-        employer_name=policy.employer.name if policy.employer else None,
-        provider_name=policy.provider.name if policy.provider else None
-    )
+    return PolicyholderPolicyResponse.model_validate(policy)
 
 
 @router.get("/claims", response_model=List[PolicyholderClaimResponse])
 async def get_claims(
     request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
@@ -190,30 +218,13 @@ async def get_claims(
     """
     Get all claims for the current policyholder
     """
-    claims = await policyholder.get_claims(
+    claims, total = await policyholder.get_claims(
         db, user_id=current_user.id, skip=skip, limit=limit
     )
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
     
-    # Transform claims to include related data
-    claim_responses = []
-    for claim in claims:
-        claim_response = PolicyholderClaimResponse(
-            id=claim.id,
-            reference_number=claim.reference_number,
-            policy_id=claim.policy_id,
-            hospital_pharmacy=claim.hospital_pharmacy,
-            reason=claim.reason,
-            requested_amount=claim.requested_amount,
-            approved_amount=claim.approved_amount,
-            status=claim.status,
-            submission_date=claim.submission_date,
-            created_at=claim.created_at,
-            updated_at=claim.updated_at,
-            policy_member_number=claim.policies.member_number if claim.policies else None
-        )
-        claim_responses.append(claim_response)
-    
-    return claim_responses
+    return [PolicyholderClaimResponse.model_validate(claim) for claim in claims]
 
 
 @router.get("/claims/{claim_id}", response_model=PolicyholderClaimResponse)
@@ -236,27 +247,16 @@ async def get_claim(
             detail="Claim not found"
         )
     
-    return PolicyholderClaimResponse(
-        id=claim.id,
-        reference_number=claim.reference_number,
-        policy_id=claim.policy_id,
-        hospital_pharmacy=claim.hospital_pharmacy,
-        reason=claim.reason,
-        requested_amount=claim.requested_amount,
-        approved_amount=claim.approved_amount,
-        status=claim.status,
-        submission_date=claim.submission_date,
-        created_at=claim.created_at,
-        updated_at=claim.updated_at,
-        policy_member_number=claim.policies.member_number if claim.policies else None
-    )
+    return PolicyholderClaimResponse.model_validate(claim)
 
 
 @router.post("/claims", response_model=PolicyholderClaimResponse, status_code=status.HTTP_201_CREATED)
 async def create_claim(
     request: Request,
+    background_tasks: BackgroundTasks,
     claim_data: PolicyholderClaimCreate,
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
 ):
@@ -271,10 +271,13 @@ async def create_claim(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unable to create claim. Policy not found or not accessible."
         )
+    claims_list_cache.clear()
     
     # Log claim creation
-    await audit_service.log_create(
-        db=db,
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_create,
+        session_factory=session_factory,
         user_id=current_user.id,
         entity_type="Claim",
         entity_id=claim.id,
@@ -286,61 +289,47 @@ async def create_claim(
         }
     )
     
-    return PolicyholderClaimResponse(
-        id=claim.id,
-        reference_number=claim.reference_number,
-        policy_id=claim.policy_id,
-        hospital_pharmacy=claim.hospital_pharmacy,
-        reason=claim.reason,
-        requested_amount=claim.requested_amount,
-        approved_amount=claim.approved_amount,
-        status=claim.status,
-        submission_date=claim.submission_date,
-        created_at=claim.created_at,
-        updated_at=claim.updated_at,
-        policy_member_number=claim.policies.member_number if claim.policies else None
-    )
+    return PolicyholderClaimResponse.model_validate(claim)
 
 
 @router.get("/notifications", response_model=List[PolicyholderNotificationResponse])
 async def get_notifications(
     request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
 ):
     """
-    Get all notifications for the current policyholder
+    Get all notifications for the current policyholder.
+    Pass the X-Next-Cursor header back as `cursor` to fetch the next page.
     """
-    notifications = await policyholder.get_notifications(
-        db, user_id=current_user.id, skip=skip, limit=limit
-    )
-    
-    # Transform notifications to include related data
-    notification_responses = []
-    for notification in notifications:
-        notification_response = PolicyholderNotificationResponse(
-            id=notification.id,
-            title=notification.title,
-            message=notification.message,
-            notification_type=notification.notification_type,
-            is_read=notification.is_read,
-            created_at=notification.created_at,
-            updated_at=notification.updated_at,
-            claim_reference_number=notification.claim.reference_number if notification.claim else None
+    try:
+        notifications = await policyholder.get_notifications(
+            db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
         )
-        notification_responses.append(notification_response)
+    cursor = next_cursor(notifications, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
     
-    return notification_responses
+    return [PolicyholderNotificationResponse.model_validate(notification) for notification in notifications]
 
 
 @router.put("/notifications/{notification_id}/read", response_model=PolicyholderNotificationResponse)
 async def mark_notification_read(
     request: Request,
+    background_tasks: BackgroundTasks,
     notification_id: UUID,
     db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
     current_user: User = Depends(get_current_policyholder),
     _: dict = Depends(access_token_bearer)
 ):
@@ -357,8 +346,10 @@ async def mark_notification_read(
         )
     
     # Log notification update
-    await audit_service.log_update(
-        db=db,
+    background_tasks.add_task(
+        audit_service.log_in_background,
+        audit_service.log_update,
+        session_factory=session_factory,
         user_id=current_user.id,
         entity_type="Notification",
         entity_id=notification_id,
@@ -366,14 +357,5 @@ async def mark_notification_read(
         details={"action": "notification_mark_read"}
     )
     
-    return PolicyholderNotificationResponse(
-        id=notification.id,
-        title=notification.title,
-        message=notification.message,
-        notification_type=notification.notification_type,
-        is_read=notification.is_read,
-        created_at=notification.created_at,
-        updated_at=notification.updated_at,
-        claim_reference_number=notification.claim.reference_number if notification.claim else None
-    )
+    return PolicyholderNotificationResponse.model_validate(notification)
 
@@ -1,5 +1,6 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 
@@ -11,6 +12,8 @@ from app.models.models import User, UserRole
 router = APIRouter()
 access_token_bearer = AccessTokenBearer()
 
+_PROVIDER_READ_FIELDS = frozenset(ProviderRead.model_fields)
+
 
 @router.post("/", response_model=ProviderRead)
 async def create_provider(
@@ -42,7 +45,11 @@ async def read_providers(
     Retrieve all insurance providers.
     """
     providers = await crud_provider.get_multi(db, skip=skip, limit=limit)
-    return providers
+    # Dump straight to orjson instead of re-validating every row against
+    # response_model; the include set keeps the ProviderRead shape.
+    return ORJSONResponse(
+        content=[provider.model_dump(include=_PROVIDER_READ_FIELDS) for provider in providers]
+    )
 
 @router.get("/{provider_id}", response_model=ProviderRead)
 async def read_provider_by_id(
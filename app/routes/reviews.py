@@ -2,32 +2,46 @@ from typing import Any, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi.responses import ORJSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core import deps 
 from app.db.session import get_db 
+from sqlalchemy.orm import raiseload, selectinload
 from sqlmodel import select 
 from app.core.deps import AccessTokenBearer
 from app.models.models import User, Claim, Review, ReviewType, ReviewDecision, ReviewItem, ReviewItemStatus, UserRole,ClaimStatus,Policy 
 from app.schemas.review import ReviewCreate,ReviewPatch,ReviewResponse 
 from app.cruds.base import CRUDBase
+from app.routes.claims import claims_list_cache
 
 router = APIRouter()
 access_token_bearer = AccessTokenBearer()  
 base = CRUDBase(Review)
 
+# Reviewer roles only see reviews of their own stage.
+REVIEW_ROLE_FILTERS = {
+    UserRole.CUSTOMER_SERVICE: Review.review_type == ReviewType.CUSTOMER_SERVICE,
+    UserRole.CLAIMS: Review.review_type == ReviewType.CLAIMS,
+    UserRole.MD: Review.review_type == ReviewType.MD,
+}
+
 @router.get("", response_model=List[dict])
 async def get_reviews(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     claim_id: Optional[UUID] = None,
-    review_type: Optional[str] = None,
+    review_type: Optional[ReviewType] = None,
     current_user: User = Depends(deps.get_current_active_user), 
     _: dict = Depends(access_token_bearer)
 ) -> Any:
 
-    # Build query
-    query = select(Review)
+    # Reviewers and items arrive in one batched IN query each, not per review.
+    query = select(Review).options(
+        selectinload(Review.reviewer).load_only(User.id, User.full_name),
+        selectinload(Review.review_items),
+        raiseload("*"),
+    )
 
     if claim_id:
         query = query.where(Review.claim_id == claim_id)
@@ -37,15 +51,14 @@ async def get_reviews(
 
     # Role-based filtering
     if current_user.role != UserRole.ADMIN:
-        if current_user.role == UserRole.CUSTOMER_SERVICE:
-            query = query.where(Review.review_type == ReviewType.CUSTOMER_SERVICE)
-        elif current_user.role == UserRole.CLAIMS:
-            query = query.where(Review.review_type == ReviewType.CLAIMS)
-        elif current_user.role == UserRole.MD:
-            query = query.where(Review.review_type == ReviewType.MD)
+        role_filter = REVIEW_ROLE_FILTERS.get(current_user.role)
+        if role_filter is not None:
+            query = query.where(role_filter)
         elif current_user.role == UserRole.POLICYHOLDER:
-            query = query.join(Review.claim).join(Claim.policy).where(
-                Claim.policy.has(policyholder_id=current_user.id)
+            query = (
+                query.join(Claim, Claim.id == Review.claim_id)
+                .join(Policy, Policy.id == Claim.policy_id)
+                .where(Policy.policyholder_id == current_user.id)
             )
 
     query = query.offset(skip).limit(limit)
@@ -55,14 +68,9 @@ async def get_reviews(
     # Build response
     response = []
     for review in reviews:
-        # Get reviewer name
-        reviewer_result = await db.execute(select(User).where(User.id == review.reviewer_id))
-        reviewer = reviewer_result.scalar_one_or_none()
+        reviewer = review.reviewer
         reviewer_name = reviewer.full_name if reviewer else "Unknown"
 
-        # Get review items
-        item_result = await db.execute(select(ReviewItem).where(ReviewItem.review_id == review.id))
-        items = item_result.scalars().all()
         item_dicts = [
             {
                 "id": item.id,
@@ -71,7 +79,7 @@ async def get_reviews(
                 "approved_amount": item.approved_amount,
                 "status": item.status,
                 "rejection_reason": item.rejection_reason
-            } for item in items
+            } for item in review.review_items
         ]
 
         response.append({
@@ -87,15 +95,16 @@ async def get_reviews(
             "items": item_dicts
         })
 
-    return response
+    # Already plain dicts of orjson-native values; skip response_model checks.
+    return ORJSONResponse(content=response)
 
 
 @router.post("/claims/{claim_id}/reviews", response_model=dict)
 async def create_review(
     claim_id: UUID,
-    review_type: str = Form(...),
+    review_type: ReviewType = Form(...),
     comments: str = Form(...),
-    decision: str = Form(...),
+    decision: ReviewDecision = Form(...),
     rejection_reason: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user), 
@@ -166,11 +175,13 @@ async def create_review(
 
         elif decision == ReviewDecision.REJECTED:
             claim.status = ClaimStatus.REJECTED
-    
-        await db.commit()
-        await db.refresh(review)
 
-        return {
+    # The review INSERT and the claim status UPDATE share one commit;
+    # eager_defaults returns the review's server defaults on flush.
+    await db.commit()
+    claims_list_cache.clear()
+
+    return {
         "id": review.id,
         "claim_id": review.claim_id,
         "review_type": review.review_type,
@@ -187,8 +198,16 @@ async def get_review(
     """
     Get review by ID
     """
-    # Fetch the review
-    result = await db.execute(select(Review).where(Review.id == review_id))
+    # Fetch the review with its reviewer and items
+    result = await db.execute(
+        select(Review)
+        .where(Review.id == review_id)
+        .options(
+            selectinload(Review.reviewer).load_only(User.id, User.full_name),
+            selectinload(Review.review_items),
+            raiseload("*"),
+        )
+    )
     review = result.scalar_one_or_none()
 
     if not review:
@@ -218,14 +237,9 @@ async def get_review(
     # elif current_user.role == UserRole.MD and review.review_type != ReviewType.MD:
     #     raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    # Get reviewer
-    reviewer_result = await db.execute(select(User).where(User.id == review.reviewer_id))
-    reviewer = reviewer_result.scalar_one_or_none()
+    reviewer = review.reviewer
     reviewer_name = reviewer.full_name if reviewer else "Unknown"
 
-    # Get review items
-    item_result = await db.execute(select(ReviewItem).where(ReviewItem.review_id == review.id))
-    items = item_result.scalars().all()
     item_dicts = [
         {
             "id": item.id,
@@ -235,7 +249,7 @@ async def get_review(
             "status": item.status,
             "rejection_reason": item.rejection_reason
         }
-        for item in items
+        for item in review.review_items
     ]
 
     # Return combined data
@@ -258,7 +272,7 @@ async def get_review(
 async def update_review(
     review_id: UUID,
     comments: Optional[str] = Form(None),
-    decision: Optional[str] = Form(None),
+    decision: Optional[ReviewDecision] = Form(None),
     rejection_reason: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db), 
      _: dict = Depends(access_token_bearer)
@@ -297,6 +311,7 @@ async def update_review(
 
     await db.commit()
     await db.refresh(review)
+    claims_list_cache.clear()
 
     return {
         "id": review.id,
@@ -313,7 +328,7 @@ async def add_review_item(
     item_name: str = Form(...),
     requested_amount: float = Form(...),
     approved_amount: float = Form(...),
-    status: str = Form(...),
+    status: ReviewItemStatus = Form(...),
     rejection_reason: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db), 
      _: dict = Depends(access_token_bearer)
@@ -341,22 +356,10 @@ async def add_review_item(
         rejection_reason=rejection_reason,
     )
 
+    # claims.approved_amount is re-totalled by the review_items trigger.
     db.add(review_item)
     await db.commit()
-    await db.refresh(review_item)
-
-    # Update claim approved amount if MD review
-    # if review.review_type == ReviewType.MD:
-    claim_result = await db.execute(select(Claim).where(Claim.id == review.claim_id))
-    claim = claim_result.scalar_one_or_none()
-
-    if claim:
-            item_result = await db.execute(select(ReviewItem).where(ReviewItem.review_id == review_id))
-            items = item_result.scalars().all()
-            total_approved = sum(item.approved_amount for item in items)
-
-            claim.approved_amount = total_approved
-            await db.commit()
+    claims_list_cache.clear()
 
     return {
         "id": review_item.id,
@@ -374,7 +377,7 @@ async def update_review_item(
     item_name: Optional[str] = Form(None),
     requested_amount: Optional[float] = Form(None),
     approved_amount: Optional[float] = Form(None),
-    status: Optional[str] = Form(None),
+    status: Optional[ReviewItemStatus] = Form(None),
     rejection_reason: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db),
      _: dict = Depends(access_token_bearer)
@@ -382,13 +385,7 @@ async def update_review_item(
     """
     Update review item
     """
-    # Fetch review
-    result = await db.execute(select(Review).where(Review.id == review_id))
-    review = result.scalar_one_or_none()
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-    
-    # Fetch review item
+    # Fetch review item; matching on review_id also proves the review exists
     result = await db.execute(
         select(ReviewItem).where(
             ReviewItem.id == item_id,
@@ -419,21 +416,9 @@ async def update_review_item(
     if rejection_reason is not None:
         review_item.rejection_reason = rejection_reason
 
+    # claims.approved_amount is re-totalled by the review_items trigger.
     await db.commit()
-    await db.refresh(review_item)
-
-    result = await db.execute(select(Claim).where(Claim.id == review.claim_id))
-    claim = result.scalar_one_or_none()
-
-    if claim:
-            result = await db.execute(
-                select(ReviewItem.approved_amount)
-                .where(ReviewItem.review_id == review_id)
-            )
-            approved_items = result.scalars().all()
-            total_approved = sum(amount for amount in approved_items if amount)
-            claim.approved_amount = total_approved
-            await db.commit()
+    claims_list_cache.clear()
 
     return {
         "id": review_item.id,
@@ -459,7 +444,8 @@ async def patch_review(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Review not found",
         )
-    review = await base.patch(db,db_obj=Review,obj_in=review_in,id=review_id)
+    review = await base.patch(db,db_obj=review,obj_in=review_in,id=review_id)
+    claims_list_cache.clear()
     return review 
 
 @router.patch("/{review_id}/items/{item_id}")
@@ -478,5 +464,6 @@ async def patch_reviewItem(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found",
         )
-    Item = await base.patch(db,db_obj=ReviewItem,obj_in=item_in,id=item_id)
+    Item = await base.patch(db,db_obj=item,obj_in=item_in,id=item_id)
+    claims_list_cache.clear()
     return Item
\ No newline at end of file
@@ -2,13 +2,14 @@ from uuid import UUID
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from app.core import deps 
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession 
 from app.db.session import get_db
 from app.cruds.crud_user import user as user_crud 
-from app.cruds.base import CRUDBase
 from app.models.models import User 
 from app.core.deps import AccessTokenBearer
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate,UserPatch
@@ -16,8 +17,11 @@ from app.schemas.user import User as UserSchema, UserCreate, UserUpdate,UserPatc
 router = APIRouter() 
 access_token_bearer = AccessTokenBearer()
 
+_USER_LIST_COLUMNS = (
+    User.id, User.email, User.full_name, User.role, User.is_active, User.created_at, User.updated_at,
+)
+
 
-base = CRUDBase(User)
 @router.get("/me")
 def read_user_me(
     current_user: User = Depends(deps.get_current_user), 
@@ -27,7 +31,7 @@ def read_user_me(
     return current_user
 
 @router.put("/me", response_model=UserSchema)
-def update_user_me(
+async def update_user_me(
     *,
     db: AsyncSession = Depends(get_db),
     user_in: UserUpdate,
@@ -35,7 +39,7 @@ def update_user_me(
     _: dict = Depends(access_token_bearer)
 ) -> Any:
   
-    user = user_crud.update(db, db_obj=current_user, obj_in=user_in)
+    user = await user_crud.update(db, db_obj=current_user, obj_in=user_in)
     return user
 
 @router.get("")
@@ -45,8 +49,10 @@ async def read_users(
     _: dict = Depends(access_token_bearer)
 ) -> Any:
 
-    users = await db.execute(select(User))
-    return users.scalars().all()
+    # Plain column rows go straight to orjson: no ORM instances to build and
+    # no jsonable_encoder pass, and the password hash is never selected.
+    result = await db.execute(select(*_USER_LIST_COLUMNS))
+    return ORJSONResponse(content=[row._asdict() for row in result])
 
 @router.post("")
 async def create_user(
@@ -56,13 +62,19 @@ async def create_user(
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
    
-    user = user_crud.get_by_email(db, email=user_in.email)
-    if user:
+    if await user_crud.exists_by_email(db, email=user_in.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The user with this email already exists in the system",
+        )
+    try:
+        user = await user_crud.create(db, obj_in=user_in)
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system",
         )
-    user = await user_crud.create(db, obj_in=user_in)
     return user
 
 @router.get("/{user_id}", response_model=UserSchema)
@@ -97,7 +109,7 @@ async def update_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    user = user_crud.update(db, db_obj=user, obj_in=user_in)
+    user = await user_crud.update(db, db_obj=user, obj_in=user_in)
     return user 
 
 @router.patch("/{user_id}", response_model=UserSchema)
@@ -115,7 +127,7 @@ async def patch_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    user = await base.patch(db,db_obj=user,obj_in=user_in,id=user_id)
+    user = await user_crud.patch(db,db_obj=user,obj_in=user_in,id=user_id)
     return user
 
 @router.delete("/{user_id}", response_model=UserSchema)
@@ -133,5 +145,5 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    user = user_crud.remove(db, id=user_id)
+    user = await user_crud.remove(db, id=user_id)
     return user
@@ -0,0 +1,27 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+MAX_BATCH_REQUESTS = 20
+
+
+class BatchRequestItem(BaseModel):
+    id: str
+    method: str = "GET"
+    url: str
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1, max_length=MAX_BATCH_REQUESTS)
+
+
+class BatchResponseItem(BaseModel):
+    id: str
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
@@ -26,12 +26,15 @@ class ClaimResponse(BaseModel):
     hospital_pharmacy:str
     reason:str
     requested_amount:float
-    approved_amount:float 
+    approved_amount:Optional[float] = None
     status:str
     submission_date:datetime 
     created_at:datetime 
     updated_at:datetime 
 
+    class Config:
+        from_attributes = True
+
 class ClaimPatch(BaseModel):
 
     reference_number:Optional[str] = None
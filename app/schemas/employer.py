@@ -27,6 +27,9 @@ class EmployerResponse(BaseModel):
      created_at :datetime 
      updated_at :datetime 
 
+     class Config:
+        from_attributes = True
+
 class EmployerPatch(BaseModel): 
 
      name : Optional[str ] = None
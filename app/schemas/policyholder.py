@@ -1,7 +1,7 @@
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime, date
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import AliasPath, BaseModel, EmailStr, Field
 
 
 # Policyholder Profile Schemas
@@ -39,11 +39,12 @@ class PolicyholderPolicyResponse(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    employer_name: Optional[str] = None
-    provider_name: Optional[str] = None
+    employer_name: Optional[str] = Field(default=None, validation_alias=AliasPath("employer", "name"))
+    provider_name: Optional[str] = Field(default=None, validation_alias=AliasPath("provider", "name"))
 
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 # Policyholder Claim Schemas
@@ -66,10 +67,11 @@ class PolicyholderClaimResponse(BaseModel):
     submission_date: datetime
     created_at: datetime
     updated_at: datetime
-    policy_member_number: Optional[str] = None
+    policy_member_number: Optional[str] = Field(default=None, validation_alias=AliasPath("policies", "member_number"))
 
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 # Policyholder Notification Schemas
@@ -81,10 +83,11 @@ class PolicyholderNotificationResponse(BaseModel):
     is_read: bool
     created_at: datetime
     updated_at: datetime
-    claim_reference_number: Optional[str] = None
+    claim_reference_number: Optional[str] = Field(default=None, validation_alias=AliasPath("claim", "reference_number"))
 
     class Config:
         from_attributes = True
+        populate_by_name = True
 
 
 class PolicyholderNotificationUpdate(BaseModel):
@@ -1,7 +1,8 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
+from app.db.session import async_session
 from app.models.models import AuditLog, AuditAction
 from app.schemas.audit import AuditLogCreate
 
@@ -48,6 +49,20 @@ class AuditService:
         
         return audit_log
     
+    @staticmethod
+    async def log_in_background(
+        log_method: Callable[..., Awaitable[AuditLog]],
+        session_factory: Callable[[], AsyncSession] = async_session,
+        **kwargs: Any
+    ) -> None:
+        """
+        Run one of the log_* helpers on its own session. Meant for
+        BackgroundTasks, which run after the request session is closed;
+        routes pass the factory from get_session_factory so overrides apply.
+        """
+        async with session_factory() as db:
+            await log_method(db=db, **kwargs)
+    
     @staticmethod
     async def log_create(
         db: AsyncSession,
@@ -60,7 +75,7 @@ class AuditService:
         """
         Log a create action
         """
-        return AuditService.log_action(
+        return await AuditService.log_action(
             db=db,
             user_id=user_id,
             action=AuditAction.CREATE,
@@ -70,6 +85,28 @@ class AuditService:
             ip_address=ip_address
         )
     
+    @staticmethod
+    def log_read(
+        db: AsyncSession,
+        user_id: UUID,
+        entity_type: str,
+        entity_id: Optional[UUID] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None
+    ) -> AuditLog:
+        """
+        Log a read action
+        """
+        return AuditService.log_action(
+            db=db,
+            user_id=user_id,
+            action=AuditAction.READ,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            details=details,
+            ip_address=ip_address
+        )
+    
     @staticmethod
     def log_update(
         db:  AsyncSession,
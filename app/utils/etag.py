@@ -0,0 +1,27 @@
+import hashlib
+from typing import Any, Optional
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Weak ETag derived from the values that determine a response, typically
+    row counts and the latest updated_at of the rows behind it.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against etag, as used for
+    conditional GETs.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -1,8 +1,13 @@
-from typing import List, Optional, Any
+import asyncio
+import logging
+from typing import Callable, List, Optional, Any
 from fastapi import BackgroundTasks
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.models import User, Claim, NotificationType
+from app.db.session import async_session
+from app.models.models import User, Claim, Notification, NotificationType
 from app.utils.elasticmail import elasticmail_client
 
 class NotificationService:
@@ -49,8 +54,6 @@ class NotificationService:
         """
         Create in-app notification in database
         """
-        from app.models.models import Notification
-        
         notification = Notification(
             user_id=user_id,
             title=title,
@@ -63,11 +66,40 @@ class NotificationService:
             notification.claim_id = claim_id
         
         db.add(notification)
-        db.commit()
-        db.refresh(notification)
+        await db.commit()
+        await db.refresh(notification)
         
         return notification
     
+    @staticmethod
+    async def dispatch(
+        emails: List[dict],
+        notifications: List[dict],
+        session_factory: Callable[[], AsyncSession] = async_session,
+    ) -> None:
+        """
+        Deliver one fan-out as a single background task: store every in-app
+        notification in one commit on a session from session_factory, then
+        send the emails concurrently.
+        """
+        if notifications:
+            # Core executemany: one INSERT for the whole batch, no ORM objects.
+            rows = [
+                {"claim_id": None, "notification_type": NotificationType.IN_APP, "is_read": False, **data}
+                for data in notifications
+            ]
+            async with session_factory() as db:
+                await db.execute(insert(Notification), rows)
+                await db.commit()
+
+        results = await asyncio.gather(
+            *(NotificationService.send_email_notification(**email) for email in emails),
+            return_exceptions=True,
+        )
+        for email, result in zip(emails, results):
+            if isinstance(result, Exception):
+                logging.error(f"Failed to send notification email to {email['to_email']}: {result}")
+
     @staticmethod
     async def notify_claim_submission(
         background_tasks: BackgroundTasks,
@@ -75,15 +107,18 @@ class NotificationService:
         claim: Claim,
         policyholder: User,
         hr_users: List[User],
-        cs_users: List[User]
+        cs_users: List[User],
+        session_factory: Callable[[], AsyncSession] = async_session
     ) -> None:
         """
         Send notifications for claim submission
         """
+        emails: List[dict] = []
+        notifications: List[dict] = []
+
         # Notify policyholder
         if policyholder.email:
-            background_tasks.add_task(
-                NotificationService.send_email_notification,
+            emails.append(dict(
                 to_email=policyholder.email,
                 subject=f"Claim Submission Confirmation - {claim.reference_number}",
                 html_content=f"""
@@ -93,23 +128,20 @@ class NotificationService:
                 <p>We will review your claim and get back to you as soon as possible.</p>
                 <p>Thank you for using our service.</p>
                 """
-            )
+            ))
         
         # Create in-app notification for policyholder
-        background_tasks.add_task(
-            NotificationService.create_in_app_notification,
-            db=db,
+        notifications.append(dict(
             user_id=policyholder.id,
             title="Claim Submitted",
             message=f"Your claim with reference number {claim.reference_number} has been successfully submitted.",
             claim_id=claim.id
-        )
+        ))
         
         # Notify HR users
         for hr_user in hr_users:
             if hr_user.email:
-                background_tasks.add_task(
-                    NotificationService.send_email_notification,
+                emails.append(dict(
                     to_email=hr_user.email,
                     subject=f"New Claim Submission - {claim.reference_number}",
                     html_content=f"""
@@ -118,23 +150,20 @@ class NotificationService:
                     <p>A new claim with reference number <strong>{claim.reference_number}</strong> has been submitted by {policyholder.full_name}.</p>
                     <p>Please review the claim at your earliest convenience.</p>
                     """
-                )
+                ))
             
             # Create in-app notification for HR user
-            background_tasks.add_task(
-                NotificationService.create_in_app_notification,
-                db=db,
+            notifications.append(dict(
                 user_id=hr_user.id,
                 title="New Claim Submission",
                 message=f"A new claim with reference number {claim.reference_number} has been submitted by {policyholder.full_name}.",
                 claim_id=claim.id
-            )
+            ))
         
         # Notify CS users
         for cs_user in cs_users:
             if cs_user.email:
-                background_tasks.add_task(
-                    NotificationService.send_email_notification,
+                emails.append(dict(
                     to_email=cs_user.email,
                     subject=f"New Claim for Review - {claim.reference_number}",
                     html_content=f"""
@@ -143,17 +172,17 @@ class NotificationService:
                     <p>A new claim with reference number <strong>{claim.reference_number}</strong> has been submitted by {policyholder.full_name} and requires your review.</p>
                     <p>Please review the claim at your earliest convenience.</p>
                     """
-                )
+                ))
             
             # Create in-app notification for CS user
-            background_tasks.add_task(
-                NotificationService.create_in_app_notification,
-                db=db,
+            notifications.append(dict(
                 user_id=cs_user.id,
                 title="New Claim for Review",
                 message=f"A new claim with reference number {claim.reference_number} has been submitted and requires your review.",
                 claim_id=claim.id
-            )
+            ))
+
+        background_tasks.add_task(NotificationService.dispatch, emails, notifications, session_factory)
     
     @staticmethod
     async def notify_claim_status_update(
@@ -161,11 +190,15 @@ class NotificationService:
         db: Session,
         claim: Claim,
         policyholder: User,
-        new_status: str
+        new_status: str,
+        session_factory: Callable[[], AsyncSession] = async_session
     ) -> None:
         """
         Send notifications for claim status update
         """
+        emails: List[dict] = []
+        notifications: List[dict] = []
+
         status_description = {
             "SUBMITTED": "submitted",
             "UNDER_REVIEW_CS": "under review by Customer Service",
@@ -180,8 +213,7 @@ class NotificationService:
         
         # Notify policyholder
         if policyholder.email:
-            background_tasks.add_task(
-                NotificationService.send_email_notification,
+            emails.append(dict(
                 to_email=policyholder.email,
                 subject=f"Claim Status Update - {claim.reference_number}",
                 html_content=f"""
@@ -191,17 +223,17 @@ class NotificationService:
                 <p>You can log in to your account to view more details.</p>
                 <p>Thank you for your patience.</p>
                 """
-            )
+            ))
         
         # Create in-app notification for policyholder
-        background_tasks.add_task(
-            NotificationService.create_in_app_notification,
-            db=db,
+        notifications.append(dict(
             user_id=policyholder.id,
             title="Claim Status Update",
             message=f"Your claim with reference number {claim.reference_number} is now {status_description}.",
             claim_id=claim.id
-        )
+        ))
+
+        background_tasks.add_task(NotificationService.dispatch, emails, notifications, session_factory)
     
     @staticmethod
     async def notify_payment_scheduled(
@@ -210,15 +242,18 @@ class NotificationService:
         claim: Claim,
         policyholder: User,
         payment_amount: float,
-        payment_date: str
+        payment_date: str,
+        session_factory: Callable[[], AsyncSession] = async_session
     ) -> None:
         """
         Send notifications for payment scheduled
         """
+        emails: List[dict] = []
+        notifications: List[dict] = []
+
         # Notify policyholder
         if policyholder.email:
-            background_tasks.add_task(
-                NotificationService.send_email_notification,
+            emails.append(dict(
                 to_email=policyholder.email,
                 subject=f"Payment Scheduled - Claim {claim.reference_number}",
                 html_content=f"""
@@ -228,16 +263,16 @@ class NotificationService:
                 <p>You can log in to your account to view more details.</p>
                 <p>Thank you for your patience.</p>
                 """
-            )
+            ))
         
         # Create in-app notification for policyholder
-        background_tasks.add_task(
-            NotificationService.create_in_app_notification,
-            db=db,
+        notifications.append(dict(
             user_id=policyholder.id,
             title="Payment Scheduled",
             message=f"A payment of ${payment_amount:.2f} for your claim with reference number {claim.reference_number} has been scheduled for {payment_date}.",
             claim_id=claim.id
-        )
+        ))
+
+        background_tasks.add_task(NotificationService.dispatch, emails, notifications, session_factory)
 
 notification_service = NotificationService()
@@ -0,0 +1,63 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+import orjson
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """
+    Encode the (created_at, id) of the last row on a page into an opaque
+    URL-safe token for the next request.
+    """
+    payload = orjson.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a token produced by encode_cursor. Raises ValueError when the
+    token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = orjson.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (TypeError, ValueError, orjson.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_after(created_col, id_col, cursor: Optional[str]) -> Optional[ColumnElement]:
+    """
+    Filter for rows that sort after the cursor in (created_at DESC, id DESC)
+    order, or None when there is no cursor. Lets Postgres seek straight into
+    the matching (created_at DESC, id DESC) index instead of skipping OFFSET rows.
+    """
+    if not cursor:
+        return None
+    created_at, row_id = decode_cursor(cursor)
+    return tuple_(created_col, id_col) < tuple_(created_at, row_id)
+
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """
+    Cursor for the page following rows, or None when this was the last page.
+    """
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def window_total(rows, skip: int) -> Optional[int]:
+    """
+    Total row count carried on rows selected with count(*) OVER (), as the
+    trailing "total" column. An empty page past the first has no row to
+    read it from, so None is returned there rather than a wrong 0.
+    """
+    if rows:
+        return rows[0].total
+    return 0 if skip == 0 else None
@@ -0,0 +1,34 @@
+"""add policyholder lookup indexes
+
+Revision ID: 3f9c1a7d2b84
+Revises: 
+Create Date: 2026-10-16 09:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a7d2b84'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_policies_policyholder_id", "policies", ["policyholder_id"])
+    op.create_index("ix_claims_policy_id", "claims", ["policy_id"])
+    op.create_index("ix_notifications_user_id_is_read", "notifications", ["user_id", "is_read"])
+    op.create_index(
+        "ix_notifications_user_id_created_at", "notifications", ["user_id", sa.text("created_at DESC")]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_user_id_created_at", table_name="notifications")
+    op.drop_index("ix_notifications_user_id_is_read", table_name="notifications")
+    op.drop_index("ix_claims_policy_id", table_name="claims")
+    op.drop_index("ix_policies_policyholder_id", table_name="policies")
@@ -0,0 +1,26 @@
+"""unique index on users.email
+
+Revision ID: 8b2e5d0c4a17
+Revises: 3f9c1a7d2b84
+Create Date: 2026-10-16 09:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e5d0c4a17'
+down_revision: Union[str, None] = '3f9c1a7d2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email", table_name="users")
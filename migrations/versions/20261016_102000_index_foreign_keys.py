@@ -0,0 +1,62 @@
+"""index foreign keys and hot filter columns
+
+Revision ID: c71d4e9a0f35
+Revises: 8b2e5d0c4a17
+Create Date: 2026-10-16 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d4e9a0f35'
+down_revision: Union[str, None] = '8b2e5d0c4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEY_INDEXES = [
+    ("policies", "employer_id"),
+    ("policies", "provider_id"),
+    ("claim_attachments", "claim_id"),
+    ("reviews", "claim_id"),
+    ("reviews", "reviewer_id"),
+    ("review_items", "review_id"),
+    ("payments", "claim_id"),
+    ("payments", "processed_by_id"),
+    ("notifications", "claim_id"),
+    ("audit_logs", "entity_id"),
+]
+
+
+def upgrade() -> None:
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.create_index(f"ix_{table}_{column}", table, [column])
+
+    op.drop_index("ix_claims_policy_id", table_name="claims")
+    op.create_index("ix_claims_policy_id_status", "claims", ["policy_id", "status"])
+
+    op.drop_index("ix_notifications_user_id_is_read", table_name="notifications")
+    op.create_index(
+        "ix_notifications_user_id_unread",
+        "notifications",
+        ["user_id"],
+        postgresql_where=sa.text("is_read = false"),
+    )
+
+    op.create_index("ix_audit_logs_user_id_created_at", "audit_logs", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_user_id_created_at", table_name="audit_logs")
+
+    op.drop_index("ix_notifications_user_id_unread", table_name="notifications")
+    op.create_index("ix_notifications_user_id_is_read", "notifications", ["user_id", "is_read"])
+
+    op.drop_index("ix_claims_policy_id_status", table_name="claims")
+    op.create_index("ix_claims_policy_id", "claims", ["policy_id"])
+
+    for table, column in reversed(FOREIGN_KEY_INDEXES):
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
@@ -0,0 +1,29 @@
+"""case-insensitive unique index on users.email
+
+Revision ID: 5ad08e3f61c2
+Revises: c71d4e9a0f35
+Create Date: 2026-10-16 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5ad08e3f61c2'
+down_revision: Union[str, None] = 'c71d4e9a0f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
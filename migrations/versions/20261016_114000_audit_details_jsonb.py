@@ -0,0 +1,45 @@
+"""store audit_logs.details as jsonb with a GIN index
+
+Revision ID: e4a93b7c18d6
+Revises: 5ad08e3f61c2
+Create Date: 2026-10-16 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a93b7c18d6'
+down_revision: Union[str, None] = '5ad08e3f61c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "audit_logs",
+        "details",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="details::jsonb",
+    )
+    op.create_index("ix_audit_logs_details", "audit_logs", ["details"], postgresql_using="gin")
+    op.create_index("ix_audit_logs_created_at", "audit_logs", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_created_at", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_details", table_name="audit_logs")
+    op.alter_column(
+        "audit_logs",
+        "details",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="details::json",
+    )
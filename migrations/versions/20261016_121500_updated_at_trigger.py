@@ -0,0 +1,65 @@
+"""maintain updated_at with a database trigger
+
+Revision ID: 0b6f2c8e9d41
+Revises: e4a93b7c18d6
+Create Date: 2026-10-16 12:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6f2c8e9d41'
+down_revision: Union[str, None] = 'e4a93b7c18d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = [
+    "users",
+    "employers",
+    "policies",
+    "claims",
+    "reviews",
+    "review_items",
+    "payments",
+    "notifications",
+    "providers",
+]
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ "
+        "BEGIN NEW.updated_at = now(); RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.alter_column(
+        "review_items",
+        "updated_at",
+        type_=sa.DateTime(),
+        existing_type=sa.String(),
+        postgresql_using="updated_at::timestamp",
+    )
+    for table in TABLES:
+        op.alter_column(table, "updated_at", server_default=sa.text("now()"))
+        op.execute(
+            f"CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+        op.alter_column(table, "updated_at", server_default=None)
+    op.alter_column(
+        "review_items",
+        "updated_at",
+        type_=sa.String(),
+        existing_type=sa.DateTime(),
+        postgresql_using="updated_at::text",
+    )
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,44 @@
+"""default insert-only timestamps to now() on the server
+
+Revision ID: 7e1a4d93c5b0
+Revises: 0b6f2c8e9d41
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1a4d93c5b0'
+down_revision: Union[str, None] = '0b6f2c8e9d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    ("users", "created_at"),
+    ("employers", "created_at"),
+    ("policies", "created_at"),
+    ("claims", "created_at"),
+    ("claims", "submission_date"),
+    ("claim_attachments", "uploaded_at"),
+    ("reviews", "created_at"),
+    ("review_items", "created_at"),
+    ("payments", "created_at"),
+    ("notifications", "created_at"),
+    ("audit_logs", "created_at"),
+    ("providers", "created_at"),
+]
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.alter_column(table, column, server_default=None)
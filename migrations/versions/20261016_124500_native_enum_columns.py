@@ -0,0 +1,81 @@
+"""store role and status columns as native postgres enums
+
+Revision ID: 2d8c6f0a7e93
+Revises: 7e1a4d93c5b0
+Create Date: 2026-10-16 12:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8c6f0a7e93'
+down_revision: Union[str, None] = '7e1a4d93c5b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ENUMS = {
+    "user_role": (
+        "POLICYHOLDER", "HR", "CUSTOMER_SERVICE", "CLAIMS", "MD", "FINANCE", "ADMIN", "USER",
+    ),
+    "claim_status": (
+        "SUBMITTED", "UNDER_REVIEW_CS", "UNDER_REVIEW_CLAIMS", "PENDING_MD_APPROVAL",
+        "APPROVED", "PARTIALLY_APPROVED", "REJECTED", "PENDING_PAYMENT", "PAID",
+    ),
+    "review_type": ("CUSTOMER_SERVICE", "CLAIMS", "MD"),
+    "review_decision": ("APPROVED", "PARTIALLY_APPROVED", "REJECTED", "NEEDS_MORE_INFO"),
+    "review_item_status": ("APPROVED", "REJECTED"),
+    "payment_status": ("SCHEDULED", "PROCESSED", "FAILED"),
+    "notification_type": ("EMAIL", "SMS", "IN_APP"),
+    "audit_action": (
+        "CREATE", "READ", "UPDATE", "DELETE", "LOGIN", "LOGOUT",
+        "APPROVE", "REJECT", "PAYMENT", "STATUS_CHANGE",
+    ),
+}
+
+# (table, column, enum name, nullable)
+COLUMNS = [
+    ("users", "role", "user_role", True),
+    ("claims", "status", "claim_status", False),
+    ("reviews", "review_type", "review_type", False),
+    ("reviews", "decision", "review_decision", False),
+    ("review_items", "status", "review_item_status", False),
+    ("payments", "payment_status", "payment_status", False),
+    ("notifications", "notification_type", "notification_type", False),
+    ("audit_logs", "action", "audit_action", False),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for name, values in ENUMS.items():
+        postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+    for table, column, name, nullable in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.ENUM(*ENUMS[name], name=name, create_type=False),
+            existing_type=sa.String(),
+            existing_nullable=nullable,
+            postgresql_using=f"{column}::{name}",
+        )
+
+
+def downgrade() -> None:
+    for table, column, name, nullable in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(),
+            existing_type=postgresql.ENUM(*ENUMS[name], name=name, create_type=False),
+            existing_nullable=nullable,
+            postgresql_using=f"{column}::text",
+        )
+    bind = op.get_bind()
+    for name, values in ENUMS.items():
+        postgresql.ENUM(*values, name=name).drop(bind, checkfirst=True)
@@ -0,0 +1,46 @@
+"""covering (user_id, created_at desc, id desc) indexes for notifications and audit logs
+
+Revision ID: 9a3e7b15d2c8
+Revises: 2d8c6f0a7e93
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3e7b15d2c8'
+down_revision: Union[str, None] = '2d8c6f0a7e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_notifications_user_id_created_at", table_name="notifications")
+    op.create_index(
+        "ix_notifications_user_id_created_at",
+        "notifications",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_include=["title", "is_read", "notification_type"],
+    )
+    op.drop_index("ix_audit_logs_user_id_created_at", table_name="audit_logs")
+    op.create_index(
+        "ix_audit_logs_user_id_created_at",
+        "audit_logs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_include=["action", "entity_type"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_user_id_created_at", table_name="audit_logs")
+    op.create_index("ix_audit_logs_user_id_created_at", "audit_logs", ["user_id", "created_at"])
+    op.drop_index("ix_notifications_user_id_created_at", table_name="notifications")
+    op.create_index(
+        "ix_notifications_user_id_created_at",
+        "notifications",
+        ["user_id", sa.text("created_at DESC")],
+    )
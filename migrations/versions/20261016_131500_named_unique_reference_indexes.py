@@ -0,0 +1,34 @@
+"""replace implicit unique constraints on reference/member numbers with named unique indexes
+
+Revision ID: 4c0f9e2b7a56
+Revises: 9a3e7b15d2c8
+Create Date: 2026-10-16 13:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c0f9e2b7a56'
+down_revision: Union[str, None] = '9a3e7b15d2c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build the new index before dropping the old constraint so uniqueness is
+    # enforced throughout.
+    op.create_index("ix_claims_reference_number", "claims", ["reference_number"], unique=True)
+    op.execute("ALTER TABLE claims DROP CONSTRAINT IF EXISTS claims_reference_number_key")
+    op.create_index("ix_policies_member_number", "policies", ["member_number"], unique=True)
+    op.execute("ALTER TABLE policies DROP CONSTRAINT IF EXISTS policies_member_number_key")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("policies_member_number_key", "policies", ["member_number"])
+    op.drop_index("ix_policies_member_number", table_name="policies")
+    op.create_unique_constraint("claims_reference_number_key", "claims", ["reference_number"])
+    op.drop_index("ix_claims_reference_number", table_name="claims")
@@ -0,0 +1,30 @@
+"""index claims on (created_at desc, id desc) for keyset pagination
+
+Revision ID: b5d1a8f3e207
+Revises: 4c0f9e2b7a56
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1a8f3e207'
+down_revision: Union[str, None] = '4c0f9e2b7a56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_claims_created_at_id",
+        "claims",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claims_created_at_id", table_name="claims")
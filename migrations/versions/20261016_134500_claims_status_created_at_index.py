@@ -0,0 +1,30 @@
+"""index claims on (status, created_at desc, id desc) for filtered listings
+
+Revision ID: 6e2b9c4d1f78
+Revises: b5d1a8f3e207
+Create Date: 2026-10-16 13:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b9c4d1f78'
+down_revision: Union[str, None] = 'b5d1a8f3e207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_claims_status_created_at",
+        "claims",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claims_status_created_at", table_name="claims")
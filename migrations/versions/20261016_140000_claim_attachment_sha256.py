@@ -0,0 +1,32 @@
+"""add sha256 digest to claim_attachments for per-claim dedup
+
+Revision ID: d83f0a6c2e19
+Revises: 6e2b9c4d1f78
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83f0a6c2e19'
+down_revision: Union[str, None] = '6e2b9c4d1f78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("claim_attachments", sa.Column("sha256", sa.String(), nullable=True))
+    op.create_index(
+        "ix_claim_attachments_claim_id_sha256",
+        "claim_attachments",
+        ["claim_id", "sha256"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claim_attachments_claim_id_sha256", table_name="claim_attachments")
+    op.drop_column("claim_attachments", "sha256")
@@ -0,0 +1,35 @@
+"""composite indexes for review lookups by claim/type and items by review/status
+
+Revision ID: 1f7c3a9e5b24
+Revises: d83f0a6c2e19
+Create Date: 2026-10-16 14:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f7c3a9e5b24'
+down_revision: Union[str, None] = 'd83f0a6c2e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composites lead with the old single-column keys, so they replace them.
+    op.drop_index("ix_reviews_claim_id", table_name="reviews")
+    op.create_index("ix_reviews_claim_id_review_type", "reviews", ["claim_id", "review_type"])
+
+    op.drop_index("ix_review_items_review_id", table_name="review_items")
+    op.create_index("ix_review_items_review_id_status", "review_items", ["review_id", "status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_items_review_id_status", table_name="review_items")
+    op.create_index("ix_review_items_review_id", "review_items", ["review_id"])
+
+    op.drop_index("ix_reviews_claim_id_review_type", table_name="reviews")
+    op.create_index("ix_reviews_claim_id", "reviews", ["claim_id"])
@@ -0,0 +1,44 @@
+"""maintain claims.approved_amount from review_items with a database trigger
+
+Revision ID: 8d4b2f6a0c13
+Revises: 1f7c3a9e5b24
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4b2f6a0c13'
+down_revision: Union[str, None] = '1f7c3a9e5b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE OR REPLACE FUNCTION sync_claim_approved_amount() RETURNS trigger AS $$ "
+        "BEGIN "
+        "UPDATE claims SET approved_amount = ("
+        "SELECT COALESCE(SUM(ri.approved_amount), 0) FROM review_items ri WHERE ri.review_id = r.id"
+        ") FROM reviews r "
+        "WHERE claims.id = r.claim_id AND r.id IN ("
+        "CASE WHEN TG_OP <> 'INSERT' THEN OLD.review_id END, "
+        "CASE WHEN TG_OP <> 'DELETE' THEN NEW.review_id END"
+        "); "
+        "RETURN NULL; "
+        "END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER review_items_sync_claim_approved_amount "
+        "AFTER INSERT OR DELETE OR UPDATE OF review_id, approved_amount ON review_items "
+        "FOR EACH ROW EXECUTE FUNCTION sync_claim_approved_amount()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS review_items_sync_claim_approved_amount ON review_items")
+    op.execute("DROP FUNCTION IF EXISTS sync_claim_approved_amount()")
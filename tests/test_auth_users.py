@@ -3,12 +3,13 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
 
-from app.db.session import Base, get_db
+from app.db.session import get_db
 from app import app
 from app.core.config import settings
 from app.models.models import User, UserRole
-from app.core.security import get_password_hash
+from app.core.security import hash_password_sync
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -20,7 +21,7 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Setup test database
-Base.metadata.create_all(bind=engine)
+SQLModel.metadata.create_all(bind=engine)
 
 # Override get_db dependency
 def override_get_db():
@@ -57,7 +58,7 @@ def setup_test_data():
     # Create admin user
     admin_user = User(
         email=test_admin["email"],
-        hashed_password=get_password_hash(test_admin["password"]),
+        hashed_password=hash_password_sync(test_admin["password"]),
         full_name=test_admin["full_name"],
         role=test_admin["role"],
         is_active=True
@@ -67,7 +68,7 @@ def setup_test_data():
     # Create policyholder user
     policyholder_user = User(
         email=test_policyholder["email"],
-        hashed_password=get_password_hash(test_policyholder["password"]),
+        hashed_password=hash_password_sync(test_policyholder["password"]),
         full_name=test_policyholder["full_name"],
         role=test_policyholder["role"],
         is_active=True
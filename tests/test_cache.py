@@ -0,0 +1,45 @@
+import time
+
+from app.utils.cache import TTLCache
+
+
+def test_get_returns_cached_value():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("token", {"user": "a"})
+    assert cache.get("token") == {"user": "a"}
+    assert "token" in cache
+
+
+def test_entry_expires_after_its_ttl():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("token", "payload", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("token") is None
+    assert "token" not in cache
+
+
+def test_non_positive_ttl_is_not_cached():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("expired", "payload", ttl=-5)
+    assert cache.get("expired") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_pop_and_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert len(cache) == 0
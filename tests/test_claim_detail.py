@@ -0,0 +1,115 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import app
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.models import User, UserRole, Employer, Policy, Claim, ClaimStatus
+
+
+# The claim detail handler runs on an AsyncSession with every relationship
+# raiseload-guarded, so it needs a real async session to be exercised. A
+# file-backed aiosqlite database with NullPool gives each event loop (seeding
+# here, the TestClient's portal later) its own connection.
+@pytest.fixture(name="async_session_factory")
+def async_session_factory_fixture(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'claims.db'}", poolclass=NullPool
+    )
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create_schema())
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture(name="seeded")
+def seeded_fixture(async_session_factory):
+    async def seed():
+        async with async_session_factory() as db:
+            policyholder = User(
+                email="detail@example.com",
+                full_name="Detail Policyholder",
+                role=UserRole.POLICYHOLDER,
+                is_active=True,
+            )
+            employer = Employer(
+                name="Detail Company",
+                contact_person="HR Manager",
+                contact_email="hr@detail.com",
+                contact_phone="1234567890",
+            )
+            db.add_all([policyholder, employer])
+            await db.flush()
+
+            policy = Policy(
+                member_number="MEM-DETAIL01",
+                plan_type="Premium",
+                policyholder_id=policyholder.id,
+                employer_id=employer.id,
+                start_date=date(2025, 1, 1),
+                end_date=date(2025, 12, 31),
+                is_active=True,
+            )
+            db.add(policy)
+            await db.flush()
+
+            claim = Claim(
+                reference_number="CLM-DETAIL1",
+                policy_id=policy.id,
+                hospital_pharmacy="Test Hospital",
+                reason="Medical test",
+                requested_amount=1000.00,
+                status=ClaimStatus.SUBMITTED,
+            )
+            db.add(claim)
+            await db.commit()
+            return {
+                "policyholder_email": policyholder.email,
+                "employer_id": employer.id,
+                "policy_id": policy.id,
+                "claim_id": claim.id,
+            }
+
+    return asyncio.run(seed())
+
+
+@pytest.fixture(name="client")
+def client_fixture(async_session_factory):
+    async def get_db_override():
+        async with async_session_factory() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = get_db_override
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def test_get_claim_by_id_loads_related_records(client: TestClient, seeded: dict):
+    # Relationships are raiseload-guarded, so any lazy access in the handler
+    # would surface here as a server error instead of a hidden extra query.
+    response = client.get(f"{settings.API_V1_STR}/claims/{seeded['claim_id']}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["policy"]["id"] == str(seeded["policy_id"])
+    assert body["employer"]["id"] == str(seeded["employer_id"])
+    assert body["policyholder"]["email"] == seeded["policyholder_email"]
+    assert body["attachments"] == []
+    assert body["reviews"] == []
+    assert body["payments"] == []
@@ -6,11 +6,11 @@ from sqlalchemy.pool import StaticPool
 import uuid
 from datetime import date
 
-from app.db.session import Base, get_db
+from app.db.session import get_db
 from app import app
 from app.core.config import settings
 from app.models.models import User, UserRole, Employer, Policy, Claim, ClaimStatus
-from app.core.security import get_password_hash
+from app.core.security import hash_password_sync
 
 # Import test setup from auth_users test
 from tests.test_auth_users import (
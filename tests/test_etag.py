@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from app.utils.etag import etag_matches, weak_etag
+
+
+def test_weak_etag_is_stable_and_value_sensitive():
+    stamp = datetime(2026, 10, 16, 14, 0)
+    assert weak_etag(3, stamp) == weak_etag(3, stamp)
+    assert weak_etag(3, stamp) != weak_etag(4, stamp)
+    assert weak_etag(3, stamp).startswith('W/"')
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = weak_etag("profile", 1)
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
@@ -0,0 +1,26 @@
+import time
+import uuid
+
+from app.utils.ids import uuid7
+
+
+def test_uuid7_sets_version_and_variant():
+    value = uuid7()
+    assert isinstance(value, uuid.UUID)
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_embeds_current_timestamp():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_is_time_ordered():
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert first < second
+    assert str(first) < str(second)
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor, next_cursor, window_total
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 16, 12, 30, 5, 123456)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_next_cursor_only_on_full_page():
+    class Row:
+        def __init__(self):
+            self.created_at = datetime(2026, 10, 16)
+            self.id = uuid.uuid4()
+
+    rows = [Row(), Row()]
+    assert next_cursor(rows, limit=3) is None
+    assert decode_cursor(next_cursor(rows, limit=2)) == (rows[-1].created_at, rows[-1].id)
+
+
+def test_window_total_reads_first_row():
+    class Row:
+        total = 42
+
+    assert window_total([Row(), Row()], skip=0) == 42
+    assert window_total([], skip=0) == 0
+    assert window_total([], skip=100) is None
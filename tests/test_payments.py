@@ -6,10 +6,10 @@ from sqlalchemy.pool import StaticPool
 import uuid
 from datetime import date
 
-from app.db.session import Base, get_db
+from app.db.session import get_db
 from app import app
 from app.core.config import settings 
-from app.core.security import get_password_hash
+from app.core.security import hash_password_sync
 from app.models.models import User, UserRole, Payment, PaymentStatus, ClaimStatus,Claim,Policy
 
 # Import test setup from auth_users test
@@ -34,7 +34,7 @@ def setup_payment_test_data():
     # Create finance user
     finance_user = User(
         email="finance@example.com",
-        hashed_password=get_password_hash("finance123"),
+        hashed_password=hash_password_sync("finance123"),
         full_name="Finance User",
         role=UserRole.FINANCE,
         is_active=True
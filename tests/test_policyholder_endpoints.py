@@ -9,7 +9,7 @@ from unittest.mock import patch, MagicMock
 from app import app
 from app.db.session import get_db
 from app.models.models import User, Policy, Claim, Notification, UserRole, ClaimStatus
-from app.core.security import create_access_token, get_password_hash
+from app.core.security import create_access_token, hash_password_sync
 
 
 # Test database setup
@@ -42,7 +42,7 @@ def policyholder_user_fixture(session: Session):
     user = User(
         id=uuid.uuid4(),
         email="policyholder@test.com",
-        hashed_password=get_password_hash("testpassword"),
+        hashed_password=hash_password_sync("testpassword"),
         full_name="Test Policyholder",
         role=UserRole.POLICYHOLDER,
         is_active=True
@@ -59,7 +59,7 @@ def admin_user_fixture(session: Session):
     user = User(
         id=uuid.uuid4(),
         email="admin@test.com",
-        hashed_password=get_password_hash("testpassword"),
+        hashed_password=hash_password_sync("testpassword"),
         full_name="Test Admin",
         role=UserRole.ADMIN,
         is_active=True
@@ -142,7 +142,7 @@ class TestPolicyholderEndpoints:
         """Test successful dashboard retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/dashboard", headers=headers)
         
         assert response.status_code == 200
@@ -167,7 +167,7 @@ class TestPolicyholderEndpoints:
         """Test successful profile retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/profile", headers=headers)
         
         assert response.status_code == 200
@@ -184,7 +184,7 @@ class TestPolicyholderEndpoints:
             "email": "updated@test.com"
         }
         
-        with patch('app.utils.audit.audit_service.log_update'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.put("/api/v1/policyholders/profile", 
                                 json=update_data, headers=headers)
         
@@ -197,7 +197,7 @@ class TestPolicyholderEndpoints:
         """Test successful policies retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/policies", headers=headers)
         
         assert response.status_code == 200
@@ -210,7 +210,7 @@ class TestPolicyholderEndpoints:
         """Test successful single policy retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get(f"/api/v1/policyholders/policies/{test_policy.id}", headers=headers)
         
         assert response.status_code == 200
@@ -230,7 +230,7 @@ class TestPolicyholderEndpoints:
         """Test successful claims retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/claims", headers=headers)
         
         assert response.status_code == 200
@@ -243,7 +243,7 @@ class TestPolicyholderEndpoints:
         """Test successful single claim retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get(f"/api/v1/policyholders/claims/{test_claim.id}", headers=headers)
         
         assert response.status_code == 200
@@ -261,7 +261,7 @@ class TestPolicyholderEndpoints:
             "requested_amount": 2000.0
         }
         
-        with patch('app.utils.audit.audit_service.log_create'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.post("/api/v1/policyholders/claims", 
                                  json=claim_data, headers=headers)
         
@@ -290,7 +290,7 @@ class TestPolicyholderEndpoints:
         """Test successful notifications retrieval"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/notifications", headers=headers)
         
         assert response.status_code == 200
@@ -303,7 +303,7 @@ class TestPolicyholderEndpoints:
         """Test successful notification mark as read"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_update'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.put(f"/api/v1/policyholders/notifications/{test_notification.id}/read", 
                                 headers=headers)
         
@@ -324,7 +324,7 @@ class TestPolicyholderEndpoints:
         """Test pagination for policies endpoint"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/policies?skip=0&limit=10", headers=headers)
         
         assert response.status_code == 200
@@ -335,7 +335,7 @@ class TestPolicyholderEndpoints:
         """Test pagination for claims endpoint"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/claims?skip=0&limit=10", headers=headers)
         
         assert response.status_code == 200
@@ -346,7 +346,7 @@ class TestPolicyholderEndpoints:
         """Test pagination for notifications endpoint"""
         headers = get_auth_headers(policyholder_user)
         
-        with patch('app.utils.audit.audit_service.log_read'):
+        with patch('app.utils.audit.audit_service.log_in_background'):
             response = client.get("/api/v1/policyholders/notifications?skip=0&limit=10", headers=headers)
         
         assert response.status_code == 200
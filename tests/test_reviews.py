@@ -6,10 +6,10 @@ from sqlalchemy.pool import StaticPool
 import uuid
 from datetime import date
 
-from app.db.session import Base, get_db
+from app.db.session import get_db
 from app import app
 from app.core.config import settings
-from app.core.security import get_password_hash
+from app.core.security import hash_password_sync
 from app.models.models import User, UserRole, Review, ReviewType, ReviewDecision, ReviewItem, ReviewItemStatus
 
 # Import test setup from auth_users test
@@ -34,7 +34,7 @@ def setup_review_test_data():
     # Create CS user
     cs_user = User(
         email="cs@example.com",
-        hashed_password=get_password_hash("cs123"),
+        hashed_password=hash_password_sync("cs123"),
         full_name="CS User",
         role=UserRole.CUSTOMER_SERVICE,
         is_active=True
@@ -44,7 +44,7 @@ def setup_review_test_data():
     # Create Claims user
     claims_user = User(
         email="claims@example.com",
-        hashed_password=get_password_hash("claims123"),
+        hashed_password=hash_password_sync("claims123"),
         full_name="Claims User",
         role=UserRole.CLAIMS,
         is_active=True
@@ -54,7 +54,7 @@ def setup_review_test_data():
     # Create MD user
     md_user = User(
         email="md@example.com",
-        hashed_password=get_password_hash("md123"),
+        hashed_password=hash_password_sync("md123"),
         full_name="MD User",
         role=UserRole.MD,
         is_active=True